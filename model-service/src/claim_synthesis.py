@@ -258,9 +258,22 @@ def build_synthesis_prompt(
     return "\n".join(prompt_parts)
 
 
+_INDENTS = ["", "  "]
+
+
+def _indent(level: int) -> str:
+    """Return the indentation prefix for a nesting level, growing the cache lazily."""
+    while len(_INDENTS) <= level:
+        _INDENTS.append("  " * len(_INDENTS))
+    return _INDENTS[level]
+
+
 def _format_claims_hierarchy(claims: list[dict[str, Any]], indent: int = 0) -> list[str]:
     """Format claim hierarchy for prompt.
 
+    Walks the hierarchy depth-first with an explicit stack, so deeply nested
+    claims do not grow the Python call stack.
+
     Parameters
     ----------
     claims : list[dict[str, Any]]
@@ -273,25 +286,27 @@ def _format_claims_hierarchy(claims: list[dict[str, Any]], indent: int = 0) -> l
     list[str]
         Formatted claim text lines.
     """
-    lines = []
-    prefix = "  " * indent
+    lines: list[str] = []
+    append = lines.append
+    stack = [(claim, indent) for claim in reversed(claims)]
 
-    for claim in claims:
+    while stack:
+        claim, level = stack.pop()
         claim_text = claim.get("text", "")
         claim_id = claim.get("id", "")
         confidence = claim.get("confidence")
 
         # Format claim line
-        line = f"{prefix}- {claim_text}"
+        line = f"{_indent(level)}- {claim_text}"
         if claim_id:
             line += f" [id: {claim_id}]"
         if confidence is not None:
             line += f" (confidence: {confidence:.2f})"
-        lines.append(line)
+        append(line)
 
-        # Recursively add subclaims
+        # Queue subclaims so they are emitted directly under their parent
         subclaims = claim.get("subclaims", [])
         if subclaims:
-            lines.extend(_format_claims_hierarchy(subclaims, indent + 1))
+            stack.extend((subclaim, level + 1) for subclaim in reversed(subclaims))
 
     return lines
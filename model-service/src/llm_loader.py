@@ -7,6 +7,8 @@ automatic fallback handling.
 """
 
 import asyncio
+import threading
+from collections.abc import AsyncGenerator
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
@@ -19,6 +21,9 @@ from transformers import (
     BitsAndBytesConfig,
     PreTrainedModel,
     PreTrainedTokenizer,
+    StoppingCriteria,
+    StoppingCriteriaList,
+    TextIteratorStreamer,
 )
 
 
@@ -101,6 +106,20 @@ class GenerationResult:
     finish_reason: str
 
 
+class _EventStoppingCriteria(StoppingCriteria):  # type: ignore[misc]
+    """Stop generation once a threading event is set."""
+
+    def __init__(self, event: threading.Event) -> None:
+        self.event = event
+
+    def __call__(
+        self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs: Any
+    ) -> torch.BoolTensor:
+        return torch.full(
+            (input_ids.shape[0],), self.event.is_set(), dtype=torch.bool, device=input_ids.device
+        )
+
+
 class LLMLoader:
     """Loader for text-only language models with quantization support.
 
@@ -225,27 +244,10 @@ class LLMLoader:
             generation_config = GenerationConfig()
 
         try:
-            inputs = self.tokenizer(
-                prompt,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-                max_length=self.config.context_length,
-            )
-
-            input_device = next(self.model.parameters()).device
-            inputs = {k: v.to(input_device) for k, v in inputs.items()}
+            inputs = self._prepare_inputs(prompt)
 
             with torch.no_grad():
-                outputs = self.model.generate(
-                    **inputs,
-                    max_new_tokens=generation_config.max_tokens,
-                    temperature=generation_config.temperature,
-                    top_p=generation_config.top_p,
-                    do_sample=generation_config.temperature > 0,
-                    pad_token_id=self.tokenizer.pad_token_id,
-                    eos_token_id=self.tokenizer.eos_token_id,
-                )
+                outputs = self.model.generate(**inputs, **self._generate_kwargs(generation_config))
 
             input_length = inputs["input_ids"].shape[1]
             generated_tokens = outputs[0][input_length:]
@@ -262,6 +264,113 @@ class LLMLoader:
         except Exception as e:
             raise RuntimeError(f"Generation failed: {e}") from e
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        generation_config: GenerationConfig | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Generate text from a prompt, yielding decoded chunks as they arrive.
+
+        Generation runs in a worker thread. Closing the generator early stops
+        it after the token being produced.
+
+        Parameters
+        ----------
+        prompt : str
+            Input text prompt for generation.
+        generation_config : GenerationConfig | None, default=None
+            Generation parameters. If None, uses default configuration.
+
+        Yields
+        ------
+        str
+            Newly decoded text.
+
+        Raises
+        ------
+        RuntimeError
+            If model is not loaded or generation fails.
+        """
+        if self.model is None or self.tokenizer is None:
+            raise RuntimeError("Model not loaded. Call load() first.")
+
+        if generation_config is None:
+            generation_config = GenerationConfig()
+
+        try:
+            inputs = self._prepare_inputs(prompt)
+        except Exception as e:
+            raise RuntimeError(f"Generation failed: {e}") from e
+
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        stop = threading.Event()
+        generation = asyncio.create_task(
+            asyncio.to_thread(
+                self._generate_into_streamer,
+                inputs,
+                {
+                    **self._generate_kwargs(generation_config),
+                    "streamer": streamer,
+                    "stopping_criteria": StoppingCriteriaList([_EventStoppingCriteria(stop)]),
+                },
+            )
+        )
+
+        try:
+            while (chunk := await asyncio.to_thread(next, streamer, None)) is not None:
+                yield chunk
+        finally:
+            stop.set()
+            await asyncio.wait([generation])
+            error = generation.exception()
+
+        if error is not None:
+            raise RuntimeError(f"Generation failed: {error}") from error
+
+    def _prepare_inputs(self, prompt: str) -> dict[str, torch.Tensor]:
+        """Tokenize a prompt and move it to the model's device."""
+        if self.model is None or self.tokenizer is None:
+            raise RuntimeError("Model not loaded. Call load() first.")
+
+        inputs = self.tokenizer(
+            prompt,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=self.config.context_length,
+        )
+
+        input_device = next(self.model.parameters()).device
+        return {k: v.to(input_device) for k, v in inputs.items()}
+
+    def _generate_kwargs(self, generation_config: GenerationConfig) -> dict[str, Any]:
+        """Build ``model.generate`` keyword arguments from a generation config."""
+        if self.tokenizer is None:
+            raise RuntimeError("Model not loaded. Call load() first.")
+
+        return {
+            "max_new_tokens": generation_config.max_tokens,
+            "temperature": generation_config.temperature,
+            "top_p": generation_config.top_p,
+            "do_sample": generation_config.temperature > 0,
+            "pad_token_id": self.tokenizer.pad_token_id,
+            "eos_token_id": self.tokenizer.eos_token_id,
+        }
+
+    def _generate_into_streamer(
+        self, inputs: dict[str, torch.Tensor], generate_kwargs: dict[str, Any]
+    ) -> None:
+        """Run blocking generation, ending the stream if it fails."""
+        if self.model is None:
+            raise RuntimeError("Model not loaded. Call load() first.")
+
+        try:
+            with torch.no_grad():
+                self.model.generate(**inputs, **generate_kwargs)
+        except Exception:
+            generate_kwargs["streamer"].end()
+            raise
+
     async def unload(self) -> None:
         """Unload the model from memory.
 
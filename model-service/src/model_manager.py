@@ -5,8 +5,10 @@ of AI models based on available GPU memory. Models are loaded on demand and
 automatically evicted when memory pressure occurs.
 """
 
+import json
 import logging
 import time
+import tomllib
 from collections import OrderedDict
 from pathlib import Path
 from typing import Any
@@ -18,6 +20,44 @@ from opentelemetry import trace
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
 
+# Prefer the libyaml-backed loader and fall back to pure Python when unavailable
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+try:
+    import ryaml as _ryaml  # Rust-backed parser from the optional fast-yaml extra
+except ImportError:
+    _ryaml = None
+
+
+def _parse_yaml(text: str) -> Any:
+    """Parse a YAML document with the fastest available backend.
+
+    Uses ryaml when the ``fast-yaml`` extra is installed and PyYAML otherwise.
+    ryaml follows YAML 1.2, so bare ``yes``/``no``/``on``/``off`` stay strings;
+    write booleans as ``true``/``false`` in configs.
+
+    Parameters
+    ----------
+    text : str
+        YAML document.
+
+    Returns
+    -------
+    Any
+        Parsed document.
+
+    Raises
+    ------
+    yaml.YAMLError
+        If the document is invalid, whichever backend parsed it.
+    """
+    if _ryaml is None:
+        return yaml.load(text, Loader=_YAML_LOADER)  # noqa: S506
+    try:
+        return _ryaml.loads(text)
+    except _ryaml.InvalidYamlError as e:
+        raise yaml.YAMLError(str(e)) from e
+
 
 class ModelConfig:
     """Configuration for a single model variant.
@@ -46,6 +86,19 @@ class ModelConfig:
         Whether model requires API key authentication.
     """
 
+    __slots__ = (
+        "model_id",
+        "framework",
+        "vram_gb",
+        "quantization",
+        "speed",
+        "description",
+        "fps",
+        "provider",
+        "api_endpoint",
+        "requires_api_key",
+    )
+
     def __init__(self, config_dict: dict[str, Any]) -> None:
         """Initialize model configuration from dictionary.
 
@@ -90,6 +143,8 @@ class TaskConfig:
         Available model options for this task.
     """
 
+    __slots__ = ("task_name", "selected", "options")
+
     def __init__(self, task_name: str, config_dict: dict[str, Any]) -> None:
         """Initialize task configuration from dictionary.
 
@@ -134,6 +189,14 @@ class InferenceConfig:
         Maximum batch size for inference.
     """
 
+    __slots__ = (
+        "max_memory_per_model",
+        "offload_threshold",
+        "warmup_on_startup",
+        "default_batch_size",
+        "max_batch_size",
+    )
+
     def __init__(self, config_dict: dict[str, Any]) -> None:
         """Initialize inference configuration from dictionary.
 
@@ -174,25 +237,56 @@ class ModelManager:
         Global inference settings.
     """
 
-    def __init__(self, config_path: str) -> None:
+    def __init__(self, config_path: str, config: dict[str, Any] | None = None) -> None:
         """Initialize ModelManager with configuration file.
 
         Parameters
         ----------
         config_path : str
-            Path to models.yaml configuration file.
+            Path to models.yaml configuration file, or a ``.json`` or
+            ``.toml`` file with the same structure.
+        config : dict[str, Any] | None
+            Already-parsed configuration. When given, config_path is only
+            recorded and the file is not read.
         """
         self.config_path = Path(config_path)
-        self.config = self._load_config()
+        self.config = self._load_config() if config is None else self._apply_config(config)
         self.loaded_models: OrderedDict[str, Any] = OrderedDict()
         self.model_load_times: dict[str, float] = {}
         self.model_memory_usage: dict[str, int] = {}
 
         logger.info(f"ModelManager initialized with config from {config_path}")
 
+    @classmethod
+    def from_yaml_string(cls, text: str, config_path: str = "<string>") -> "ModelManager":
+        """Create a ModelManager from YAML text without touching the filesystem.
+
+        Parameters
+        ----------
+        text : str
+            YAML document with the same structure as models.yaml.
+        config_path : str
+            Label recorded as the configuration source.
+
+        Returns
+        -------
+        ModelManager
+            Manager initialized from the parsed text.
+
+        Raises
+        ------
+        yaml.YAMLError
+            If the text is invalid YAML.
+        """
+        return cls(config_path, config=_parse_yaml(text))
+
     def _load_config(self) -> dict[str, Any]:
         """Load configuration from YAML file.
 
+        Files with a ``.json`` or ``.toml`` suffix are parsed with the stdlib
+        json or tomllib modules instead, which are cheaper than YAML for small
+        configurations.
+
         Returns
         -------
         dict[str, Any]
@@ -203,14 +297,39 @@ class ModelManager:
         FileNotFoundError
             If configuration file does not exist.
         yaml.YAMLError
-            If configuration file is invalid.
+            If configuration file is invalid YAML.
+        json.JSONDecodeError
+            If a ``.json`` configuration file is invalid.
+        tomllib.TOMLDecodeError
+            If a ``.toml`` configuration file is invalid.
         """
         if not self.config_path.exists():
             raise FileNotFoundError(f"Config file not found: {self.config_path}")
 
-        with self.config_path.open() as f:
-            config: dict[str, Any] = yaml.safe_load(f)
+        text = self.config_path.read_text()
+        config: dict[str, Any]
+        if self.config_path.suffix == ".json":
+            config = json.loads(text)
+        elif self.config_path.suffix == ".toml":
+            config = tomllib.loads(text)
+        else:
+            config = _parse_yaml(text)
+
+        return self._apply_config(config)
 
+    def _apply_config(self, config: dict[str, Any]) -> dict[str, Any]:
+        """Build task and inference settings from a parsed configuration.
+
+        Parameters
+        ----------
+        config : dict[str, Any]
+            Parsed configuration dictionary.
+
+        Returns
+        -------
+        dict[str, Any]
+            The same configuration dictionary.
+        """
         self.tasks: dict[str, TaskConfig] = {
             task_name: TaskConfig(task_name, task_config)
             for task_name, task_config in config["models"].items()
@@ -231,7 +231,13 @@ class TrackingRequest(BaseModel):
 
     video_id: str = Field(..., description="Unique identifier for the video")
     initial_masks: list[str] = Field(
-        ..., description="Base64-encoded initial masks for frame 0 (numpy arrays)"
+        default_factory=list,
+        description="Base64-encoded initial masks for frame 0 (numpy arrays)",
+    )
+    initial_masks_rle: list[dict[str, Any]] | None = Field(
+        default=None,
+        description="RLE-encoded initial masks for frame 0 with 'size' and 'counts' keys "
+        "(alternative to initial_masks)",
     )
     object_ids: list[int] = Field(..., description="Object IDs to track")
     frame_numbers: list[int] = Field(
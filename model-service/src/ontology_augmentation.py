@@ -6,13 +6,21 @@ language models. It includes prompt templates, LLM integration, response parsing
 and confidence scoring.
 """
 
+import asyncio
+import functools
 import json
 import logging
 import re
-from dataclasses import dataclass
+import sys
+import weakref
+from collections import OrderedDict
+from dataclasses import astuple, dataclass, field
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+from numpy.typing import NDArray
+
 from .external_apis.base import ExternalAPIConfig
 from .external_apis.router import ExternalModelRouter
 from .llm_loader import GenerationConfig, LLMConfig, LLMLoader
@@ -20,8 +28,29 @@ from .models import OntologyType
 
 logger = logging.getLogger(__name__)
 
+try:
+    from orjson import loads as _json_loads  # Rust parser from the optional fast-json extra
+except ImportError:
+    from json import loads as _json_loads  # type: ignore[assignment]
+
+try:
+    from numba import njit as _njit  # LLVM-compiled kernels from the optional fast-scoring extra
+except ImportError:
+    _njit = None
+
+# Start of a JSON array of objects, and the only characters that affect its nesting
+_ARRAY_START_RE = re.compile(r"\[\s*\{")
+_STRUCTURAL_RE = re.compile(r'[\[\]"\\]')
+_WORD_RE = re.compile(r"\b\w+\b")
+_JSON_CODE_FENCE_RE = re.compile(r"```json\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE)
+_CODE_FENCE_RE = re.compile(r"```\s*(.*?)\s*```", re.DOTALL)
+
+
+# Canonical objects for the known categories, so equal categories share one string
+_TARGET_CATEGORIES = {c: sys.intern(c) for c in ("entity", "event", "role", "relation")}
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class AugmentationContext:
     """Context for ontology augmentation.
 
@@ -37,6 +66,13 @@ class AugmentationContext:
         Role of the persona (e.g., "Marine Biologist").
     information_need : str | None, default=None
         Specific information needs of the persona.
+
+    Attributes
+    ----------
+    domain_tokens : frozenset[str]
+        Lowercased whitespace-separated words of the domain, computed once.
+    existing_set : frozenset[str]
+        Existing type names for constant-time membership checks.
     """
 
     domain: str
@@ -44,16 +80,66 @@ class AugmentationContext:
     target_category: str
     persona_role: str | None = None
     information_need: str | None = None
+    domain_tokens: frozenset[str] = field(init=False, repr=False, compare=False)
+    existing_set: frozenset[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Intern the target category and precompute lookup sets."""
+        category = _TARGET_CATEGORIES.get(self.target_category, self.target_category)
+        object.__setattr__(self, "target_category", category)
+        object.__setattr__(self, "domain_tokens", frozenset(self.domain.lower().split()))
+        object.__setattr__(self, "existing_set", frozenset(self.existing_types))
 
 
 MIN_DESCRIPTION_LENGTH = 20
 MIN_EXAMPLES_COUNT = 2
 HIGH_CONFIDENCE_THRESHOLD = 0.8
+RESPONSE_CACHE_SIZE = 128
+
+# Raw LLM responses keyed on (model_id, prompt), least recently used first
+_response_cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+
+_GENERATION_CONFIG = GenerationConfig(
+    max_tokens=2048,
+    temperature=0.7,
+    top_p=0.9,
+    stop_sequences=None,
+)
+
+# Loaded models kept for reuse_loader calls, keyed on the LLMConfig fields and cache_dir
+_loader_cache: dict[tuple[Any, ...], LLMLoader] = {}
+# asyncio locks are bound to one event loop, so each loop guards the cache with its own
+_loader_cache_locks: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, asyncio.Lock
+] = weakref.WeakKeyDictionary()
+
+
+_CATEGORY_INSTRUCTIONS = {
+    "entity": {
+        "definition": "Entity types represent categories of physical or abstract objects that can be observed, identified, and tracked in videos.",
+        "examples": "For a retail domain: Customer, Product, Employee, Shopping Cart, Payment Terminal",
+    },
+    "event": {
+        "definition": "Event types represent categories of actions, occurrences, or state changes that happen at specific times.",
+        "examples": "For a sports domain: Pitch, Swing, Catch, Slide, Home Run",
+    },
+    "role": {
+        "definition": "Role types represent functions or capacities that entities can fulfill in events.",
+        "examples": "For a medical domain: Surgeon, Patient, Assistant, Observer, Anesthesiologist",
+    },
+    "relation": {
+        "definition": "Relation types represent semantic connections between entities or events.",
+        "examples": "For a film production domain: Contains, Appears With, Replaced By, Preceded By, Located In",
+    },
+}
 
 
 def create_augmentation_prompt(context: AugmentationContext, max_suggestions: int = 10) -> str:
     """Create a prompt for ontology type augmentation.
 
+    Prompts are cached on the context's field values, so retries and repeated
+    requests for the same context reuse the built string.
+
     Parameters
     ----------
     context : AugmentationContext
@@ -66,42 +152,41 @@ def create_augmentation_prompt(context: AugmentationContext, max_suggestions: in
     str
         Formatted prompt for the language model.
     """
-    category_instructions = {
-        "entity": {
-            "definition": "Entity types represent categories of physical or abstract objects that can be observed, identified, and tracked in videos.",
-            "examples": "For a retail domain: Customer, Product, Employee, Shopping Cart, Payment Terminal",
-        },
-        "event": {
-            "definition": "Event types represent categories of actions, occurrences, or state changes that happen at specific times.",
-            "examples": "For a sports domain: Pitch, Swing, Catch, Slide, Home Run",
-        },
-        "role": {
-            "definition": "Role types represent functions or capacities that entities can fulfill in events.",
-            "examples": "For a medical domain: Surgeon, Patient, Assistant, Observer, Anesthesiologist",
-        },
-        "relation": {
-            "definition": "Relation types represent semantic connections between entities or events.",
-            "examples": "For a film production domain: Contains, Appears With, Replaced By, Preceded By, Located In",
-        },
-    }
-
-    instructions = category_instructions.get(
-        context.target_category, category_instructions["entity"]
+    return _build_augmentation_prompt(
+        context.domain,
+        tuple(context.existing_types),
+        context.target_category,
+        context.persona_role,
+        context.information_need,
+        max_suggestions,
     )
 
-    existing_types_str = ", ".join(context.existing_types) if context.existing_types else "None"
+
+@functools.lru_cache(maxsize=512)
+def _build_augmentation_prompt(
+    domain: str,
+    existing_types: tuple[str, ...],
+    target_category: str,
+    persona_role: str | None,
+    information_need: str | None,
+    max_suggestions: int,
+) -> str:
+    """Build the augmentation prompt from hashable context fields."""
+    instructions = _CATEGORY_INSTRUCTIONS.get(target_category, _CATEGORY_INSTRUCTIONS["entity"])
+
+    existing_types_str = ", ".join(existing_types) if existing_types else "None"
 
     persona_context = ""
-    if context.persona_role:
-        persona_context += f"\n- Persona Role: {context.persona_role}"
-    if context.information_need:
-        persona_context += f"\n- Information Need: {context.information_need}"
+    if persona_role:
+        persona_context += f"\n- Persona Role: {persona_role}"
+    if information_need:
+        persona_context += f"\n- Information Need: {information_need}"
 
-    prompt = f"""You are an expert in ontology design for video annotation systems. Your task is to suggest new {context.target_category} types for a domain-specific ontology.
+    prompt = f"""You are an expert in ontology design for video annotation systems. Your task is to suggest new {target_category} types for a domain-specific ontology.
 
-Domain: {context.domain}{persona_context}
+Domain: {domain}{persona_context}
 
-Existing {context.target_category} types: {existing_types_str}
+Existing {target_category} types: {existing_types_str}
 
 Definition:
 {instructions["definition"]}
@@ -110,7 +195,7 @@ Example from a different domain:
 {instructions["examples"]}
 
 Task:
-Suggest {max_suggestions} new {context.target_category} types that would be useful for this domain. For each type:
+Suggest {max_suggestions} new {target_category} types that would be useful for this domain. For each type:
 1. Provide a concise name (1-3 words, use PascalCase for multi-word names)
 2. Provide a clear description (1-2 sentences)
 3. If applicable, specify a parent type from the existing types
@@ -139,6 +224,65 @@ Return ONLY the JSON array, no additional text or explanation."""
     return prompt  # noqa: RET504
 
 
+def _find_json_array(text: str) -> str | None:
+    """Locate the first JSON array of objects embedded in text.
+
+    Scans only brackets, quotes, and backslashes from the first ``[{``,
+    tracking nesting depth and skipping brackets inside string literals.
+
+    Parameters
+    ----------
+    text : str
+        Text that may contain a JSON array surrounded by prose.
+
+    Returns
+    -------
+    str | None
+        The array substring, or None if no balanced array of objects is found.
+    """
+    start = _ARRAY_START_RE.search(text)
+    if start is None:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped_at = -1
+    for match in _STRUCTURAL_RE.finditer(text, start.start()):
+        pos = match.start()
+        if pos == escaped_at:
+            continue
+        char = match.group()
+        if in_string:
+            if char == "\\":
+                escaped_at = pos + 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+            if depth == 0:
+                return text[start.start() : pos + 1]
+
+    return None
+
+
+def _decode_json(text: str) -> Any:
+    """Decode JSON, falling back to the standard parser when the fast one fails.
+
+    orjson rejects the ``NaN`` and ``Infinity`` literals that ``json.loads``
+    accepts, so the fallback keeps results independent of the fast-json extra.
+    """
+    try:
+        return _json_loads(text)
+    except json.JSONDecodeError:
+        if _json_loads is json.loads:
+            raise
+        return json.loads(text)
+
+
 def parse_llm_response(response_text: str) -> list[dict[str, Any]]:
     """Parse LLM response text into structured type suggestions.
 
@@ -159,16 +303,20 @@ def parse_llm_response(response_text: str) -> list[dict[str, Any]]:
     """
     text = response_text.strip()
 
-    json_match = re.search(r"\[\s*\{.*?\}\s*\]", text, re.DOTALL)
-    if json_match:
-        text = json_match.group(0)
-
     try:
-        parsed = json.loads(text)
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse JSON response: {e}")
-        logger.debug(f"Response text: {text}")
-        raise ValueError(f"Invalid JSON in LLM response: {e}") from e
+        # Well-formed responses are a bare array, so try them before scanning
+        parsed = _json_loads(text) if text.startswith("[") else None
+    except json.JSONDecodeError:
+        parsed = None
+
+    if parsed is None:
+        text = _find_json_array(text) or text
+        try:
+            parsed = _decode_json(text)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON response: {e}")
+            logger.debug(f"Response text: {text}")
+            raise ValueError(f"Invalid JSON in LLM response: {e}") from e
 
     if not isinstance(parsed, list):
         raise ValueError("LLM response must be a JSON array")
@@ -223,22 +371,179 @@ def calculate_confidence(suggestion: dict[str, Any], context: AugmentationContex
     if suggestion["examples"] and len(suggestion["examples"]) >= MIN_EXAMPLES_COUNT:
         confidence += 0.1
 
-    if suggestion["parent"] and suggestion["parent"] in context.existing_types:
+    if suggestion["parent"] and suggestion["parent"] in context.existing_set:
         confidence += 0.15
     elif suggestion["name"] and len(suggestion["name"]) > 0:
         confidence -= 0.1
 
-    name_lower = suggestion["name"].lower()
-    domain_lower = context.domain.lower()
-    domain_words = set(domain_lower.split())
-
-    name_words = set(re.findall(r"\b\w+\b", name_lower))
-    if name_words & domain_words:
+    name_words = _WORD_RE.findall(suggestion["name"].lower())
+    if not context.domain_tokens.isdisjoint(name_words):
         confidence += 0.1
 
     return min(confidence, 1.0)
 
 
+def _numpy_score_kernel(
+    has_name: NDArray[np.bool_],
+    desc_len: NDArray[np.int64],
+    n_examples: NDArray[np.int64],
+    valid_parent: NDArray[np.bool_],
+    domain_overlap: NDArray[np.bool_],
+) -> NDArray[np.float64]:
+    """Combine per-suggestion features into confidence scores."""
+    scores = np.full(has_name.shape[0], 0.5)
+    scores += np.where(has_name, 0.1, 0.0)
+    scores += np.where(desc_len >= MIN_DESCRIPTION_LENGTH, 0.15, 0.0)
+    scores += np.where(n_examples >= MIN_EXAMPLES_COUNT, 0.1, 0.0)
+    scores += np.where(valid_parent, 0.15, np.where(has_name, -0.1, 0.0))
+    scores += np.where(domain_overlap, 0.1, 0.0)
+    return np.minimum(scores, 1.0)
+
+
+def _fused_score_kernel(
+    has_name: NDArray[np.bool_],
+    desc_len: NDArray[np.int64],
+    n_examples: NDArray[np.int64],
+    valid_parent: NDArray[np.bool_],
+    domain_overlap: NDArray[np.bool_],
+) -> NDArray[np.float64]:
+    """Single-loop variant of the scoring kernel, compiled with Numba when available."""
+    scores = np.empty(has_name.shape[0])
+    for i in range(has_name.shape[0]):
+        score = 0.5
+        if has_name[i]:
+            score += 0.1
+        if desc_len[i] >= MIN_DESCRIPTION_LENGTH:
+            score += 0.15
+        if n_examples[i] >= MIN_EXAMPLES_COUNT:
+            score += 0.1
+        if valid_parent[i]:
+            score += 0.15
+        elif has_name[i]:
+            score -= 0.1
+        if domain_overlap[i]:
+            score += 0.1
+        scores[i] = min(score, 1.0)
+    return scores
+
+
+# Interpreted, the loop is far slower than the array version, so it is only used compiled
+_score_kernel = _njit(cache=True)(_fused_score_kernel) if _njit is not None else _numpy_score_kernel
+
+
+def score_suggestions(
+    suggestions: list[dict[str, Any]], context: AugmentationContext
+) -> NDArray[np.float64]:
+    """Calculate confidence scores for a batch of type suggestions.
+
+    Vectorized equivalent of calling ``calculate_confidence`` on each
+    suggestion: per-feature arrays are built once and the weighted terms are
+    added in the same order, so scores match the scalar version exactly.
+
+    Parameters
+    ----------
+    suggestions : list[dict[str, Any]]
+        Parsed type suggestions with name, description, parent, examples.
+    context : AugmentationContext
+        Original augmentation context.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        Confidence score between 0.0 and 1.0 for each suggestion.
+    """
+    count = len(suggestions)
+    existing_types = context.existing_set
+    domain_tokens = context.domain_tokens
+
+    has_name = np.fromiter((bool(s["name"]) for s in suggestions), dtype=bool, count=count)
+    desc_len = np.fromiter(
+        (len(s["description"] or "") for s in suggestions), dtype=np.int64, count=count
+    )
+    n_examples = np.fromiter(
+        (len(s["examples"] or ()) for s in suggestions), dtype=np.int64, count=count
+    )
+    valid_parent = np.fromiter(
+        (bool(s["parent"]) and s["parent"] in existing_types for s in suggestions),
+        dtype=bool,
+        count=count,
+    )
+    domain_overlap = np.fromiter(
+        (not domain_tokens.isdisjoint(_WORD_RE.findall(s["name"].lower())) for s in suggestions),
+        dtype=bool,
+        count=count,
+    )
+
+    return _score_kernel(has_name, desc_len, n_examples, valid_parent, domain_overlap)
+
+
+def _top_k_indices(scores: NDArray[np.float64], k: int) -> NDArray[np.intp]:
+    """Return indices of the k highest scores, highest first.
+
+    Selects candidates with a linear-time partition and sorts only those, so
+    the result matches ``np.argsort(-scores, kind="stable")[:k]``: among equal
+    scores, earlier indices come first.
+
+    Parameters
+    ----------
+    scores : NDArray[np.float64]
+        Score per item.
+    k : int
+        Number of indices to return.
+
+    Returns
+    -------
+    NDArray[np.intp]
+        Indices into ``scores`` in descending score order.
+    """
+    if not 0 < k < scores.size:
+        return np.argsort(-scores, kind="stable")[:k]
+
+    kth_largest = np.partition(scores, scores.size - k)[scores.size - k]
+    above = np.flatnonzero(scores > kth_largest)
+    tied = np.flatnonzero(scores == kth_largest)[: k - above.size]
+    candidates = np.sort(np.concatenate((above, tied)))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def _rank_suggestions(
+    parsed_suggestions: list[dict[str, Any]],
+    context: AugmentationContext,
+    max_suggestions: int,
+) -> list[OntologyType]:
+    """Score parsed suggestions and return the most confident ones.
+
+    Parameters
+    ----------
+    parsed_suggestions : list[dict[str, Any]]
+        Output of ``parse_llm_response``.
+    context : AugmentationContext
+        Original augmentation context.
+    max_suggestions : int
+        Maximum number of suggestions to return.
+
+    Returns
+    -------
+    list[OntologyType]
+        Suggestions sorted by descending confidence; ties keep response order.
+    """
+    scores = score_suggestions(parsed_suggestions, context)
+    order = _top_k_indices(scores, max_suggestions)
+
+    # parse_llm_response already coerced every field and scores lie in [0, 1],
+    # so the per-item Pydantic validation pass is skipped
+    return [
+        OntologyType.model_construct(
+            name=parsed_suggestions[i]["name"],
+            description=parsed_suggestions[i]["description"],
+            parent=parsed_suggestions[i].get("parent"),
+            confidence=float(scores[i]),
+            examples=parsed_suggestions[i].get("examples", []),
+        )
+        for i in order
+    ]
+
+
 def extract_json_from_response(response_text: str) -> str:
     """Extract JSON from LLM response, handling markdown code blocks.
 
@@ -253,12 +558,14 @@ def extract_json_from_response(response_text: str) -> str:
         Extracted JSON string.
     """
     text = response_text.strip()
+    if "```" not in text:
+        return text
 
-    json_code_block = re.search(r"```json\s*(.*?)\s*```", text, re.DOTALL | re.IGNORECASE)
+    json_code_block = _JSON_CODE_FENCE_RE.search(text)
     if json_code_block:
         return json_code_block.group(1).strip()
 
-    code_block = re.search(r"```\s*(.*?)\s*```", text, re.DOTALL)
+    code_block = _CODE_FENCE_RE.search(text)
     if code_block:
         return code_block.group(1).strip()
 
@@ -321,22 +628,7 @@ async def augment_ontology_with_external_api(
             json_text = extract_json_from_response(response_text)
             parsed_suggestions = parse_llm_response(json_text)
 
-            suggestions = []
-            for suggestion_dict in parsed_suggestions:
-                confidence = calculate_confidence(suggestion_dict, context)
-
-                suggestion = OntologyType(
-                    name=suggestion_dict["name"],
-                    description=suggestion_dict["description"],
-                    parent=suggestion_dict.get("parent"),
-                    confidence=confidence,
-                    examples=suggestion_dict.get("examples", []),
-                )
-                suggestions.append(suggestion)
-
-            suggestions.sort(key=lambda x: x.confidence, reverse=True)
-
-            return suggestions[:max_suggestions]
+            return _rank_suggestions(parsed_suggestions, context, max_suggestions)
 
         finally:
             await router.close_all()
@@ -351,6 +643,11 @@ async def augment_ontology_with_llm(
     llm_config: LLMConfig,
     max_suggestions: int = 10,
     cache_dir: Path | None = None,
+    *,
+    reuse_cached_response: bool = False,
+    loader: LLMLoader | None = None,
+    reuse_loader: bool = False,
+    stream: bool = False,
 ) -> list[OntologyType]:
     """Suggest new ontology types using a language model.
 
@@ -364,6 +661,19 @@ async def augment_ontology_with_llm(
         Maximum number of type suggestions to generate.
     cache_dir : Path | None, default=None
         Directory for caching model weights.
+    reuse_cached_response : bool, default=False
+        Reuse the response from an earlier call with the same model and prompt
+        instead of loading the model and sampling a new one. Only non-streaming
+        calls that set this flag add their responses to the cache.
+    loader : LLMLoader | None, default=None
+        Already loaded model to generate with. The caller owns it, so it is
+        neither loaded nor unloaded here.
+    reuse_loader : bool, default=False
+        Keep the model loaded after generating and reuse it for later calls
+        with the same configuration. Release it with ``release_cached_loaders``.
+    stream : bool, default=False
+        Stream the response and stop generating once ``max_suggestions``
+        complete suggestion objects have been produced.
 
     Returns
     -------
@@ -377,42 +687,259 @@ async def augment_ontology_with_llm(
     ValueError
         If LLM response cannot be parsed.
     """
+    prompt = create_augmentation_prompt(context, max_suggestions)
+    cache_key = (llm_config.model_id, prompt)
+
+    response_text = _response_cache.get(cache_key) if reuse_cached_response else None
+    if response_text is not None:
+        logger.info("Reusing cached ontology augmentation response")
+        _response_cache.move_to_end(cache_key)
+    else:
+        response_text = await _generate_augmentation_text(
+            llm_config,
+            prompt,
+            cache_dir,
+            loader,
+            reuse_loader,
+            stream_limit=max_suggestions if stream else None,
+        )
+        # A streamed response may be cut short at max_suggestions, so never cache it
+        if reuse_cached_response and not stream:
+            _response_cache[cache_key] = response_text
+            if len(_response_cache) > RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+
+    parsed_suggestions = parse_llm_response(response_text)
+
+    return _rank_suggestions(parsed_suggestions, context, max_suggestions)
+
+
+async def augment_many(
+    contexts: list[AugmentationContext],
+    llm_config: LLMConfig,
+    max_suggestions: int = 10,
+    cache_dir: Path | None = None,
+) -> list[list[OntologyType]]:
+    """Suggest new ontology types for several contexts with one loaded model.
+
+    The model is loaded once, the contexts are augmented one after another,
+    and the model is unloaded after the last context or the first failure.
+
+    Parameters
+    ----------
+    contexts : list[AugmentationContext]
+        Contexts to augment.
+    llm_config : LLMConfig
+        Configuration for the language model to use.
+    max_suggestions : int, default=10
+        Maximum number of type suggestions per context.
+    cache_dir : Path | None, default=None
+        Directory for caching model weights.
+
+    Returns
+    -------
+    list[list[OntologyType]]
+        Suggestions for each context, in the order of ``contexts``.
+
+    Raises
+    ------
+    RuntimeError
+        If LLM loading or generation fails.
+    ValueError
+        If an LLM response cannot be parsed.
+    """
+    if not contexts:
+        return []
+
     loader = LLMLoader(llm_config, cache_dir)
 
     try:
         await loader.load()
+        return [
+            await augment_ontology_with_llm(
+                context, llm_config, max_suggestions, cache_dir, loader=loader
+            )
+            for context in contexts
+        ]
 
-        prompt = create_augmentation_prompt(context, max_suggestions)
+    finally:
+        await loader.unload()
+
+
+async def _generate_augmentation_text(
+    llm_config: LLMConfig,
+    prompt: str,
+    cache_dir: Path | None,
+    loader: LLMLoader | None = None,
+    reuse_loader: bool = False,
+    stream_limit: int | None = None,
+) -> str:
+    """Generate a response to the prompt, loading the model if needed.
+
+    Parameters
+    ----------
+    llm_config : LLMConfig
+        Configuration for the language model to use.
+    prompt : str
+        Augmentation prompt.
+    cache_dir : Path | None
+        Directory for caching model weights.
+    loader : LLMLoader | None, default=None
+        Caller-owned loaded model to use as is.
+    reuse_loader : bool, default=False
+        Take the model from, or add it to, the shared loader cache instead of
+        loading and unloading it around this call.
+    stream_limit : int | None, default=None
+        If set, stream the response and stop after this many objects.
+
+    Returns
+    -------
+    str
+        Raw generated text.
+    """
+    if loader is not None:
+        return await _generate_with_loader(loader, prompt, stream_limit)
 
-        generation_config = GenerationConfig(
-            max_tokens=2048,
-            temperature=0.7,
-            top_p=0.9,
-            stop_sequences=None,
+    if reuse_loader:
+        return await _generate_with_loader(
+            await _get_cached_loader(llm_config, cache_dir), prompt, stream_limit
         )
 
-        result = await loader.generate(prompt, generation_config)
+    loader = LLMLoader(llm_config, cache_dir)
 
-        parsed_suggestions = parse_llm_response(result.text)
+    try:
+        await loader.load()
+        return await _generate_with_loader(loader, prompt, stream_limit)
 
-        suggestions = []
-        for suggestion_dict in parsed_suggestions:
-            confidence = calculate_confidence(suggestion_dict, context)
+    finally:
+        await loader.unload()
 
-            suggestion = OntologyType(
-                name=suggestion_dict["name"],
-                description=suggestion_dict["description"],
-                parent=suggestion_dict.get("parent"),
-                confidence=confidence,
-                examples=suggestion_dict.get("examples", []),
-            )
-            suggestions.append(suggestion)
 
-        suggestions.sort(key=lambda x: x.confidence, reverse=True)
+async def _generate_with_loader(
+    loader: LLMLoader, prompt: str, stream_limit: int | None = None
+) -> str:
+    """Generate a response to the prompt with a loaded model."""
+    if stream_limit is not None:
+        return await _stream_with_loader(loader, prompt, stream_limit)
+
+    result = await loader.generate(prompt, _GENERATION_CONFIG)
+    return result.text
+
 
-        return suggestions[:max_suggestions]
+async def _stream_with_loader(loader: LLMLoader, prompt: str, limit: int) -> str:
+    """Stream a response, stopping once ``limit`` JSON objects are complete.
 
+    Returns the complete objects as a JSON array when generation is cut short,
+    otherwise the full streamed text.
+    """
+    scanner = _ObjectScanner()
+    chunks: list[str] = []
+    items: list[str] = []
+    stream = loader.generate_stream(prompt, _GENERATION_CONFIG)
+
+    try:
+        async for chunk in stream:
+            chunks.append(chunk)
+            items.extend(scanner.feed(chunk))
+            if len(items) >= limit:
+                return "[" + ",".join(items[:limit]) + "]"
     finally:
+        await stream.aclose()
+
+    return "".join(chunks)
+
+
+class _ObjectScanner:
+    """Incrementally extract the objects of a streamed JSON array.
+
+    Like ``_find_json_array``, scanning starts at the first ``[`` followed by
+    ``{``, so braces in prose before the array are ignored, and it stops at the
+    array's closing bracket. Tracks brace depth and string state one character
+    at a time, so each chunk is scanned once regardless of how much text came
+    before it.
+    """
+
+    def __init__(self) -> None:
+        self._item: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._bracket_seen = False
+        self._in_array = False
+        self._done = False
+
+    def feed(self, chunk: str) -> list[str]:
+        """Consume a chunk and return the objects it completed."""
+        completed = []
+        for char in chunk:
+            if self._done:
+                break
+            if not self._depth:
+                if not self._in_array:
+                    if char == "[":
+                        self._bracket_seen = True
+                    elif char == "{" and self._bracket_seen:
+                        self._in_array = True
+                        self._depth = 1
+                        self._item.append(char)
+                    elif not char.isspace():
+                        self._bracket_seen = False
+                elif char == "{":
+                    self._depth = 1
+                    self._item.append(char)
+                elif char == "]":
+                    self._done = True
+                continue
+
+            self._item.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if not self._depth:
+                    completed.append("".join(self._item))
+                    self._item.clear()
+        return completed
+
+
+def _loader_cache_lock() -> asyncio.Lock:
+    """Return the lock guarding the loader cache on the running event loop."""
+    loop = asyncio.get_running_loop()
+    lock = _loader_cache_locks.get(loop)
+    if lock is None:
+        lock = _loader_cache_locks[loop] = asyncio.Lock()
+    return lock
+
+
+async def _get_cached_loader(llm_config: LLMConfig, cache_dir: Path | None) -> LLMLoader:
+    """Return the shared loader for a configuration, loading it on first use."""
+    key = (*astuple(llm_config), cache_dir)
+
+    async with _loader_cache_lock():
+        loader = _loader_cache.get(key)
+        if loader is None:
+            loader = LLMLoader(llm_config, cache_dir)
+            await loader.load()
+            _loader_cache[key] = loader
+        return loader
+
+
+async def release_cached_loaders() -> None:
+    """Unload every model kept loaded by ``reuse_loader`` augmentation calls."""
+    async with _loader_cache_lock():
+        loaders = list(_loader_cache.values())
+        _loader_cache.clear()
+
+    for loader in loaders:
         await loader.unload()
 
 
@@ -586,7 +586,8 @@ async def track_objects(request: TrackingRequest) -> TrackingResponse:
     Parameters
     ----------
     request : TrackingRequest
-        Tracking request with video_id, initial_masks, object_ids, and frame_numbers.
+        Tracking request with video_id, initial_masks or initial_masks_rle, object_ids,
+        and frame_numbers.
 
     Returns
     -------
@@ -611,7 +612,7 @@ async def track_objects(request: TrackingRequest) -> TrackingResponse:
 
         from .models import TrackingFrameResult, TrackingMaskData
         from .summarization import get_video_path_for_id
-        from .tracking_loader import TrackingConfig, create_tracking_loader
+        from .tracking_loader import TrackingConfig, create_tracking_loader, decode_rle_mask
         from .video_downloader import cleanup_temp_video, download_video_if_needed
 
         # Track if we downloaded a temporary file for cleanup
@@ -619,10 +620,16 @@ async def track_objects(request: TrackingRequest) -> TrackingResponse:
 
         try:
             # Validate request
-            if len(request.initial_masks) != len(request.object_ids):
+            if (request.initial_masks_rle is None) == (not request.initial_masks):
                 raise HTTPException(
                     status_code=400,
-                    detail=f"Number of initial_masks ({len(request.initial_masks)}) "
+                    detail="Provide exactly one of initial_masks or initial_masks_rle",
+                )
+            num_masks = len(request.initial_masks_rle or request.initial_masks)
+            if num_masks != len(request.object_ids):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Number of initial masks ({num_masks}) "
                     f"must match object_ids length ({len(request.object_ids)})",
                 )
 
@@ -698,6 +705,20 @@ async def track_objects(request: TrackingRequest) -> TrackingResponse:
                         status_code=400,
                         detail=f"Invalid mask encoding: {e!s}",
                     ) from e
+            for mask_rle in request.initial_masks_rle or []:
+                try:
+                    mask_array = decode_rle_mask(mask_rle)
+                    if mask_array.shape != (height, width):
+                        raise ValueError(
+                            f"mask size {list(mask_array.shape)} does not match "
+                            f"video size {[height, width]}"
+                        )
+                    initial_masks_np.append(mask_array)
+                except Exception as e:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Invalid mask encoding: {e!s}",
+                    ) from e
 
             # Load frames
             frames_list = []
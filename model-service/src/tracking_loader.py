@@ -91,6 +91,31 @@ class TrackingMask:
         return rle  # type: ignore[no-any-return]
 
 
+def decode_rle_mask(rle: dict[str, Any]) -> np.ndarray[Any, np.dtype[np.uint8]]:
+    """Decode a Run-Length Encoded mask into a binary mask.
+
+    Accepts the compressed COCO form produced by ``TrackingMask.to_rle`` as well
+    as uncompressed RLE whose 'counts' is a list of alternating run lengths,
+    starting with a run of zeros, in column-major order.
+
+    Parameters
+    ----------
+    rle : dict[str, Any]
+        RLE-encoded mask with 'size' ([height, width]) and 'counts' keys.
+
+    Returns
+    -------
+    np.ndarray
+        Binary mask with shape (height, width).
+    """
+    from pycocotools import mask as mask_utils
+
+    height, width = rle["size"]
+    if isinstance(rle["counts"], list):
+        rle = mask_utils.frPyObjects(rle, height, width)
+    return mask_utils.decode(rle)  # type: ignore[no-any-return]
+
+
 @dataclass
 class TrackingFrame:
     """Tracking results for a single video frame.
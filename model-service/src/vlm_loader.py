@@ -6,8 +6,12 @@ Pixtral Large, and Qwen2.5-VL. Models can be loaded with different quantization
 strategies and inference frameworks (SGLang or vLLM).
 """
 
+import functools
+import gc
 import logging
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
@@ -21,11 +25,28 @@ from transformers import (
     AutoTokenizer,
     BitsAndBytesConfig,
     Qwen2VLForConditionalGeneration,
+    StoppingCriteriaList,
+    TextIteratorStreamer,
 )
+from transformers.utils import is_flash_attn_2_available
+
+from .llm_loader import _EventStoppingCriteria
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=8)
+def _cached_tokenizer(model_id: str, trust_remote_code: bool) -> Any:
+    """Load a tokenizer once per (model_id, trust_remote_code) pair."""
+    return AutoTokenizer.from_pretrained(model_id, trust_remote_code=trust_remote_code)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_processor(model_id: str, trust_remote_code: bool) -> Any:
+    """Load a processor once per (model_id, trust_remote_code) pair."""
+    return AutoProcessor.from_pretrained(model_id, trust_remote_code=trust_remote_code)
+
+
 class QuantizationType(str, Enum):
     """Supported quantization types for model compression."""
 
@@ -43,6 +64,74 @@ class InferenceFramework(str, Enum):
     TRANSFORMERS = "transformers"
 
 
+# Vision encoder and projector attribute names across the supported VLMs
+_VISION_MODULE_NAMES = ("vision_model", "vision_tower", "multi_modal_projector")
+
+
+@functools.cache
+def _bnb_config(
+    quantization: QuantizationType,
+    vision_quantization: QuantizationType = QuantizationType.FOUR_BIT,
+) -> Any:
+    """Build the bitsandbytes config for a quantization scheme once.
+
+    Construction is deferred to first use because bitsandbytes is an optional
+    dependency and BitsAndBytesConfig validates its presence on init. When the
+    language model is NF4 but the vision encoder uses a different scheme, the
+    encoder is left out of the 4-bit pass so it can be handled separately.
+    """
+    if quantization == QuantizationType.FOUR_BIT:
+        skip_modules = None
+        if vision_quantization != QuantizationType.FOUR_BIT:
+            skip_modules = [*_VISION_MODULE_NAMES, "lm_head"]
+        return BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_compute_dtype=torch.bfloat16,
+            bnb_4bit_use_double_quant=True,
+            bnb_4bit_quant_type="nf4",
+            llm_int8_skip_modules=skip_modules,
+        )
+    if quantization == QuantizationType.EIGHT_BIT:
+        return BitsAndBytesConfig(
+            load_in_8bit=True,
+            bnb_8bit_compute_dtype=torch.bfloat16,
+        )
+    return None
+
+
+def _replace_linear_int8(module: torch.nn.Module) -> None:
+    """Swap every ``nn.Linear`` under a module for a bitsandbytes int8 layer."""
+    import bitsandbytes as bnb
+
+    for name, child in module.named_children():
+        if isinstance(child, torch.nn.Linear):
+            int8_linear = bnb.nn.Linear8bitLt(
+                child.in_features,
+                child.out_features,
+                bias=child.bias is not None,
+                has_fp16_weights=False,
+                threshold=6.0,
+            )
+            # Int8Params only quantizes inside .to() when its data starts on the CPU,
+            # and device_map="auto" has already placed the weights on the GPU
+            int8_linear.weight = bnb.nn.Int8Params(
+                child.weight.data.cpu(), requires_grad=False, has_fp16_weights=False
+            )
+            if child.bias is not None:
+                int8_linear.bias = child.bias
+            setattr(module, name, int8_linear.to(child.weight.device))
+        else:
+            _replace_linear_int8(child)
+
+
+def _quantize_vision_int8(model: Any) -> None:
+    """Quantize the vision encoder and projector of a loaded VLM to int8."""
+    for attr in _VISION_MODULE_NAMES:
+        module = getattr(model, attr, None)
+        if isinstance(module, torch.nn.Module):
+            _replace_linear_int8(module)
+
+
 @dataclass
 class VLMConfig:
     """Configuration for Vision Language Model loading and inference.
@@ -61,6 +150,11 @@ class VLMConfig:
         Device to load the model on.
     trust_remote_code : bool, default=True
         Whether to trust remote code from HuggingFace.
+    vision_quantization : QuantizationType, default=QuantizationType.EIGHT_BIT
+        Quantization for the Llama 4 Maverick vision encoder when the language
+        model is loaded at 4-bit with Transformers; other loaders ignore it. The
+        encoder is small and runs once per request, so int8 avoids NF4
+        dequantization on the encode path.
     """
 
     model_id: str
@@ -69,6 +163,7 @@ class VLMConfig:
     max_memory_gb: int | None = None
     device: str = "cuda"
     trust_remote_code: bool = True
+    vision_quantization: QuantizationType = QuantizationType.EIGHT_BIT
 
 
 class VLMLoader(ABC):
@@ -134,8 +229,16 @@ class VLMLoader(ABC):
         """
         pass
 
-    def unload(self) -> None:
-        """Unload the model from memory to free GPU resources."""
+    def unload(self, release_to_os: bool = False) -> None:
+        """Unload the model from memory to free GPU resources.
+
+        Parameters
+        ----------
+        release_to_os : bool, default=False
+            Whether to return cached CUDA blocks to the driver. By default the
+            blocks stay in PyTorch's caching allocator so the next load can
+            reuse them without going through cudaMalloc again.
+        """
         if self.model is not None:
             del self.model
             self.model = None
@@ -145,10 +248,31 @@ class VLMLoader(ABC):
         if self.tokenizer is not None:  # type: ignore[unreachable]
             del self.tokenizer
             self.tokenizer = None
-        if torch.cuda.is_available():
+        gc.collect()
+        if release_to_os and torch.cuda.is_available():
             torch.cuda.empty_cache()
         logger.info("Model unloaded and memory cleared")
 
+    def _get_attention_kwargs(self) -> dict[str, Any]:
+        """Select the attention kernel for Transformers model loading.
+
+        Returns
+        -------
+        dict[str, Any]
+            ``{"attn_implementation": "flash_attention_2"}`` when the configured
+            device is an Ampere or newer GPU and flash-attn is installed,
+            ``{"attn_implementation": "sdpa"}`` on such GPUs without flash-attn,
+            otherwise an empty dict so Transformers keeps its default.
+        """
+        device = torch.device(self.config.device)
+        if device.type != "cuda" or not torch.cuda.is_available():
+            return {}
+        if torch.cuda.get_device_capability(device)[0] < 8:
+            return {}
+        if is_flash_attn_2_available():
+            return {"attn_implementation": "flash_attention_2"}
+        return {"attn_implementation": "sdpa"}
+
     def _get_quantization_config(self) -> Any:
         """Create quantization configuration for model loading.
 
@@ -156,20 +280,9 @@ class VLMLoader(ABC):
         -------
         BitsAndBytesConfig | None
             Quantization config for bitsandbytes, or None if no quantization.
+            Configs are shared between loaders with the same quantization.
         """
-        if self.config.quantization == QuantizationType.FOUR_BIT:
-            return BitsAndBytesConfig(
-                load_in_4bit=True,
-                bnb_4bit_compute_dtype=torch.bfloat16,
-                bnb_4bit_use_double_quant=True,
-                bnb_4bit_quant_type="nf4",
-            )
-        if self.config.quantization == QuantizationType.EIGHT_BIT:
-            return BitsAndBytesConfig(
-                load_in_8bit=True,
-                bnb_8bit_compute_dtype=torch.bfloat16,
-            )
-        return None
+        return _bnb_config(self.config.quantization)
 
 
 class Llama4MaverickLoader(VLMLoader):
@@ -179,6 +292,17 @@ class Llama4MaverickLoader(VLMLoader):
     supporting multimodal input with 10M context length.
     """
 
+    def __init__(self, config: VLMConfig) -> None:
+        """Initialize the Llama 4 Maverick loader with configuration.
+
+        Parameters
+        ----------
+        config : VLMConfig
+            Configuration for model loading and inference.
+        """
+        super().__init__(config)
+        self._preproc_stream: Any = None
+
     def load(self) -> None:
         """Load Llama 4 Maverick model with configured settings."""
         try:
@@ -194,11 +318,43 @@ class Llama4MaverickLoader(VLMLoader):
             else:
                 self._load_with_transformers()
 
+            # Only the Transformers backend copies inputs itself; SGLang and vLLM
+            # handle their own transfers (a failed import falls back to Transformers)
+            if (
+                self.processor is not None
+                and self.config.device.startswith("cuda")
+                and torch.cuda.is_available()
+            ):
+                self._preproc_stream = torch.cuda.Stream(device=self.config.device)
+
             logger.info("Llama 4 Maverick loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load Llama 4 Maverick: {e}")
             raise RuntimeError(f"Model loading failed: {e}") from e
 
+    def _get_quantization_config(self) -> Any:
+        """Create quantization configuration for model loading.
+
+        Returns
+        -------
+        BitsAndBytesConfig | None
+            Quantization config for bitsandbytes, or None if no quantization.
+            With 4-bit language weights and an int8 vision encoder, the encoder
+            and ``lm_head`` are left out of the NF4 pass.
+        """
+        return _bnb_config(self.config.quantization, self.config.vision_quantization)
+
+    def unload(self, release_to_os: bool = False) -> None:
+        """Unload the model and drop the input-copy stream.
+
+        Parameters
+        ----------
+        release_to_os : bool, default=False
+            Whether to return cached CUDA blocks to the driver.
+        """
+        self._preproc_stream = None
+        super().unload(release_to_os)
+
     def _load_with_sglang(self) -> None:
         """Load model using SGLang framework for optimized inference."""
         try:
@@ -255,12 +411,8 @@ class Llama4MaverickLoader(VLMLoader):
         """Load model using HuggingFace Transformers library."""
         quantization_config = self._get_quantization_config()
 
-        self.processor = AutoProcessor.from_pretrained(
-            self.config.model_id, trust_remote_code=self.config.trust_remote_code
-        )
-        self.tokenizer = AutoTokenizer.from_pretrained(
-            self.config.model_id, trust_remote_code=self.config.trust_remote_code
-        )
+        self.processor = _cached_processor(self.config.model_id, self.config.trust_remote_code)
+        self.tokenizer = _cached_tokenizer(self.config.model_id, self.config.trust_remote_code)
 
         self.model = AutoModelForVision2Seq.from_pretrained(
             self.config.model_id,
@@ -268,7 +420,14 @@ class Llama4MaverickLoader(VLMLoader):
             device_map="auto",
             trust_remote_code=self.config.trust_remote_code,
             torch_dtype=torch.bfloat16,
+            **self._get_attention_kwargs(),
         )
+        if (
+            self.config.quantization == QuantizationType.FOUR_BIT
+            and self.config.vision_quantization == QuantizationType.EIGHT_BIT
+            and torch.cuda.is_available()
+        ):
+            _quantize_vision_int8(self.model)
         logger.info("Model loaded with Transformers")
 
     def generate(
@@ -331,6 +490,30 @@ class Llama4MaverickLoader(VLMLoader):
         )
         return outputs[0].outputs[0].text  # type: ignore[no-any-return]
 
+    def _prepare_inputs(self, images: list[Image.Image], prompt: str) -> dict[str, Any]:
+        """Preprocess images and prompt and move the tensors to the model device.
+
+        On GPU the inputs are pinned and the host-to-device copies are issued on
+        a dedicated stream so they overlap with work still queued on the default
+        stream; the default stream then waits on it before decoding starts.
+        """
+        inputs = self.processor(images=images, text=prompt, return_tensors="pt")  # type: ignore[misc]
+        if self._preproc_stream is None:
+            return {k: v.to(self.config.device) for k, v in inputs.items()}
+
+        default_stream = torch.cuda.current_stream()
+        with torch.cuda.stream(self._preproc_stream):
+            inputs = {
+                k: v.pin_memory().to(self.config.device, non_blocking=True)
+                for k, v in inputs.items()
+            }
+        default_stream.wait_stream(self._preproc_stream)
+        # The tensors were allocated on the side stream; keep the caching allocator
+        # from reusing their memory until the default stream is done with them
+        for tensor in inputs.values():
+            tensor.record_stream(default_stream)
+        return inputs
+
     def _generate_with_transformers(
         self,
         images: list[Image.Image],
@@ -342,8 +525,7 @@ class Llama4MaverickLoader(VLMLoader):
         if self.processor is None or self.tokenizer is None:
             raise RuntimeError("Processor and tokenizer not initialized")
 
-        inputs = self.processor(images=images, text=prompt, return_tensors="pt")
-        inputs = {k: v.to(self.config.device) for k, v in inputs.items()}
+        inputs = self._prepare_inputs(images, prompt)
 
         with torch.inference_mode():
             outputs = self.model.generate(
@@ -355,6 +537,90 @@ class Llama4MaverickLoader(VLMLoader):
 
         return self.tokenizer.decode(outputs[0], skip_special_tokens=True)
 
+    def generate_stream(
+        self,
+        images: list[Image.Image],
+        prompt: str,
+        max_new_tokens: int = 512,
+        temperature: float = 0.7,
+    ) -> Iterator[str]:
+        """Stream decoded text chunks as Llama 4 Maverick generates them.
+
+        Generation runs in a worker thread and text is yielded through a
+        ``TextIteratorStreamer``, so callers receive the first tokens without
+        waiting for the full sequence. Closing the generator early stops
+        generation after the token being produced. Only the Transformers
+        backend supports streaming.
+
+        Parameters
+        ----------
+        images : list[Image.Image]
+            List of PIL images to process.
+        prompt : str
+            Text prompt for the model.
+        max_new_tokens : int, default=512
+            Maximum number of tokens to generate.
+        temperature : float, default=0.7
+            Sampling temperature for generation.
+
+        Yields
+        ------
+        str
+            Decoded text chunks in generation order.
+
+        Raises
+        ------
+        RuntimeError
+            If the model is not loaded through Transformers or generation fails.
+        """
+        if self.model is None:
+            raise RuntimeError("Model not loaded. Call load() first.")
+        if self.processor is None or self.tokenizer is None:
+            raise RuntimeError("Streaming requires the Transformers backend")
+
+        inputs = self._prepare_inputs(images, prompt)
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        stop = threading.Event()
+        generate_kwargs = {
+            "streamer": streamer,
+            "stopping_criteria": StoppingCriteriaList([_EventStoppingCriteria(stop)]),
+            "max_new_tokens": max_new_tokens,
+            "temperature": temperature,
+            "do_sample": True,
+        }
+        errors: list[Exception] = []
+
+        def _generate() -> None:
+            try:
+                self._generate_into_streamer(inputs, generate_kwargs)
+            except Exception as e:
+                errors.append(e)
+
+        worker = threading.Thread(target=_generate, daemon=True)
+        worker.start()
+        try:
+            yield from streamer
+        finally:
+            stop.set()
+            worker.join()
+
+        if errors:
+            logger.error(f"Generation failed: {errors[0]}")
+            raise RuntimeError(f"Text generation failed: {errors[0]}") from errors[0]
+
+    def _generate_into_streamer(
+        self, inputs: dict[str, Any], generate_kwargs: dict[str, Any]
+    ) -> None:
+        """Run blocking generation, ending the stream if it fails."""
+        try:
+            if self.model is None:
+                raise RuntimeError("Model not loaded. Call load() first.")
+            with torch.inference_mode():
+                self.model.generate(**inputs, **generate_kwargs)
+        except Exception:
+            generate_kwargs["streamer"].end()
+            raise
+
 
 class Gemma3Loader(VLMLoader):
     """Loader for Gemma 3 27B Vision Language Model.
@@ -431,12 +697,8 @@ class Gemma3Loader(VLMLoader):
 
         quantization_config = self._get_quantization_config()
 
-        self.processor = AutoProcessor.from_pretrained(
-            self.config.model_id, trust_remote_code=self.config.trust_remote_code
-        )
-        self.tokenizer = AutoTokenizer.from_pretrained(
-            self.config.model_id, trust_remote_code=self.config.trust_remote_code
-        )
+        self.processor = _cached_processor(self.config.model_id, self.config.trust_remote_code)
+        self.tokenizer = _cached_tokenizer(self.config.model_id, self.config.trust_remote_code)
 
         self.model = AutoModelForVision2Seq.from_pretrained(
             self.config.model_id,
@@ -444,6 +706,7 @@ class Gemma3Loader(VLMLoader):
             device_map="auto",
             trust_remote_code=self.config.trust_remote_code,
             torch_dtype=torch.bfloat16,
+            **self._get_attention_kwargs(),
         )
         logger.info("Model loaded with Transformers")
 
@@ -556,9 +819,7 @@ class InternVL3Loader(VLMLoader):
 
         quantization_config = self._get_quantization_config()
 
-        self.tokenizer = AutoTokenizer.from_pretrained(
-            self.config.model_id, trust_remote_code=self.config.trust_remote_code
-        )
+        self.tokenizer = _cached_tokenizer(self.config.model_id, self.config.trust_remote_code)
 
         self.model = AutoModel.from_pretrained(
             self.config.model_id,
@@ -581,9 +842,18 @@ class InternVL3Loader(VLMLoader):
             raise RuntimeError("Model not loaded. Call load() first.")
 
         try:
+            on_cuda = torch.device(self.config.device).type == "cuda"
             pixel_values_list = []
             for image in images:
-                pixel_values = self.model.load_image(image, max_num=12).to(torch.bfloat16).cuda()
+                pixel_values = self.model.load_image(image, max_num=12)
+                if on_cuda:
+                    # Pinned host memory lets the H2D copy overlap with the next image's
+                    # preprocessing
+                    pixel_values = pixel_values.pin_memory().to(
+                        self.config.device, dtype=torch.bfloat16, non_blocking=True
+                    )
+                else:
+                    pixel_values = pixel_values.to(self.config.device, dtype=torch.bfloat16)
                 pixel_values_list.append(pixel_values)
 
             generation_config = {
@@ -658,12 +928,8 @@ class PixtralLargeLoader(VLMLoader):
 
         quantization_config = self._get_quantization_config()
 
-        self.processor = AutoProcessor.from_pretrained(
-            self.config.model_id, trust_remote_code=self.config.trust_remote_code
-        )
-        self.tokenizer = AutoTokenizer.from_pretrained(
-            self.config.model_id, trust_remote_code=self.config.trust_remote_code
-        )
+        self.processor = _cached_processor(self.config.model_id, self.config.trust_remote_code)
+        self.tokenizer = _cached_tokenizer(self.config.model_id, self.config.trust_remote_code)
 
         self.model = AutoModelForVision2Seq.from_pretrained(
             self.config.model_id,
@@ -814,12 +1080,8 @@ class Qwen25VLLoader(VLMLoader):
 
         quantization_config = self._get_quantization_config()
 
-        self.processor = AutoProcessor.from_pretrained(
-            self.config.model_id, trust_remote_code=self.config.trust_remote_code
-        )
-        self.tokenizer = AutoTokenizer.from_pretrained(
-            self.config.model_id, trust_remote_code=self.config.trust_remote_code
-        )
+        self.processor = _cached_processor(self.config.model_id, self.config.trust_remote_code)
+        self.tokenizer = _cached_tokenizer(self.config.model_id, self.config.trust_remote_code)
 
         self.model = Qwen2VLForConditionalGeneration.from_pretrained(
             self.config.model_id,
@@ -827,6 +1089,7 @@ class Qwen25VLLoader(VLMLoader):
             device_map="auto",
             trust_remote_code=self.config.trust_remote_code,
             torch_dtype=torch.bfloat16,
+            **self._get_attention_kwargs(),
         )
         logger.info("Model loaded with Transformers")
 
@@ -934,13 +1197,33 @@ class Qwen25VLLoader(VLMLoader):
         return self.tokenizer.decode(outputs[0], skip_special_tokens=True)
 
 
+_MODEL_NAME_SEPARATORS = str.maketrans("", "", "-_. ")
+
+_LOADER_TABLE: dict[str, type[VLMLoader]] = {
+    "llama4maverick": Llama4MaverickLoader,
+    "gemma3": Gemma3Loader,
+    "gemma327b": Gemma3Loader,
+    "internvl3": InternVL3Loader,
+    "internvl378b": InternVL3Loader,
+    "pixtral": PixtralLargeLoader,
+    "pixtrallarge": PixtralLargeLoader,
+    "qwen25vl": Qwen25VLLoader,
+    "qwen25vl7b": Qwen25VLLoader,
+    "qwen25vl72b": Qwen25VLLoader,
+}
+
+_LOADER_PREFIXES = sorted(_LOADER_TABLE.items(), key=lambda item: len(item[0]), reverse=True)
+
+
 def create_vlm_loader(model_name: str, config: VLMConfig) -> VLMLoader:
     """Factory function to create appropriate VLM loader based on model name.
 
     Parameters
     ----------
     model_name : str
-        Name of the model to load. Supported values:
+        Name of the model to load. Matching ignores case, a leading
+        organization such as "google/", and the separators "-", "_", "."
+        and spaces. Supported values:
         - "llama-4-maverick" or "llama4-maverick"
         - "gemma-3-27b" or "gemma3"
         - "internvl3-78b" or "internvl3"
@@ -959,22 +1242,17 @@ def create_vlm_loader(model_name: str, config: VLMConfig) -> VLMLoader:
     ValueError
         If model_name is not recognized.
     """
-    model_name_lower = model_name.lower().replace("_", "-")
-
-    if "llama-4-maverick" in model_name_lower or "llama4-maverick" in model_name_lower:
-        return Llama4MaverickLoader(config)
-    if "gemma-3" in model_name_lower or "gemma3" in model_name_lower:
-        return Gemma3Loader(config)
-    if "internvl3" in model_name_lower:
-        return InternVL3Loader(config)
-    if "pixtral" in model_name_lower:
-        return PixtralLargeLoader(config)
-    if (
-        "qwen2.5-vl" in model_name_lower
-        or "qwen25vl" in model_name_lower
-        or "qwen-2-5-vl" in model_name_lower
-    ):
-        return Qwen25VLLoader(config)
+    # Accept full Hugging Face ids such as "google/gemma-3-27b-it"
+    key = model_name.rsplit("/", 1)[-1].lower().translate(_MODEL_NAME_SEPARATORS)
+    loader_cls = _LOADER_TABLE.get(key)
+    if loader_cls is None:
+        # Fall back to prefix matching for suffixed names like "gemma-3-27b-it"
+        loader_cls = next(
+            (cls for alias, cls in _LOADER_PREFIXES if key.startswith(alias)),
+            None,
+        )
+    if loader_cls is not None:
+        return loader_cls(config)
     raise ValueError(
         f"Unknown model name: {model_name}. Supported models: "
         "llama-4-maverick, gemma-3-27b, internvl3-78b, pixtral-large, qwen2.5-vl-72b"
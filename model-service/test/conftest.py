@@ -9,11 +9,15 @@ from fastapi.testclient import TestClient
 from src.main import app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client() -> TestClient:
     """
     Creates a FastAPI test client for making HTTP requests to the model service.
 
+    The client is shared by the whole session. It is not entered as a context
+    manager, so the app lifespan (which loads config/models.yaml and warms up
+    models) never runs; route tests install a mocked model manager instead.
+
     Returns:
         TestClient instance configured with the model service app
 
@@ -20,6 +20,7 @@ from src.tracking_loader import (
     TrackingResult,
     YOLO11SegLoader,
     create_tracking_loader,
+    decode_rle_mask,
 )
 
 pytestmark = pytest.mark.requires_models
@@ -144,6 +145,22 @@ class TestTrackingMask:
         assert rle["counts"] == "test_rle"
         mock_encode.assert_called_once()
 
+    def test_decode_rle_mask_round_trip(self) -> None:
+        """Test that decoding to_rle output restores the mask."""
+        mask = np.zeros((48, 64), dtype=np.uint8)
+        mask[10:20, 5:30] = 1
+        tracking_mask = TrackingMask(mask=mask, confidence=0.85, object_id=1)
+
+        np.testing.assert_array_equal(decode_rle_mask(tracking_mask.to_rle()), mask)
+
+    def test_decode_rle_mask_uncompressed_counts(self) -> None:
+        """Test decoding RLE given as a list of run lengths."""
+        decoded = decode_rle_mask({"size": [4, 3], "counts": [4, 8]})
+
+        expected = np.zeros((4, 3), dtype=np.uint8)
+        expected[:, 1:] = 1  # Runs are column-major
+        np.testing.assert_array_equal(decoded, expected)
+
 
 class TestTrackingFrame:
     """Tests for TrackingFrame dataclass."""
@@ -1,10 +1,14 @@
 """Tests for Vision Language Model loader."""
 
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 import torch
 from PIL import Image
+from transformers import GenerationMixin, PreTrainedTokenizerBase, ProcessorMixin
 
 from src.vlm_loader import (
     Gemma3Loader,
@@ -15,16 +19,35 @@ from src.vlm_loader import (
     QuantizationType,
     Qwen25VLLoader,
     VLMConfig,
+    _cached_processor,
+    _cached_tokenizer,
+    _replace_linear_int8,
     create_vlm_loader,
 )
 
 pytestmark = pytest.mark.requires_models
 
 
+@pytest.fixture(autouse=True)
+def _clear_preprocessor_cache():
+    """Drop cached tokenizers and processors so each test sees its own mocks."""
+    _cached_tokenizer.cache_clear()
+    _cached_processor.cache_clear()
+    yield
+    _cached_tokenizer.cache_clear()
+    _cached_processor.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def _red_array():
+    """Create the red RGB pixel buffer once per session."""
+    return np.full((224, 224, 3), (255, 0, 0), dtype=np.uint8)
+
+
 @pytest.fixture
-def sample_image():
+def sample_image(_red_array):
     """Create a sample PIL image for testing."""
-    return Image.new("RGB", (224, 224), color="red")
+    return Image.fromarray(_red_array)
 
 
 @pytest.fixture
@@ -33,6 +56,67 @@ def sample_images(sample_image):
     return [sample_image]
 
 
+@pytest.fixture(scope="session")
+def fake_pixel_values():
+    """Create a seeded pixel-value tensor shared across the session."""
+    torch.manual_seed(0)
+    return torch.randn(1, 3, 224, 224)
+
+
+@pytest.fixture(scope="session")
+def fake_input_ids():
+    """Create a seeded input-id tensor shared across the session."""
+    torch.manual_seed(0)
+    return torch.randint(0, 1000, (1, 10))
+
+
+@pytest.fixture(scope="session")
+def fake_generated_ids():
+    """Create a generated-id tensor shared across the session."""
+    return torch.tensor([[1, 2, 3, 4]])
+
+
+@pytest.fixture(scope="session")
+def _session_cuda():
+    """Create a single stand-in for ``torch.cuda`` reporting an available GPU."""
+    fc = MagicMock()
+    fc.is_available.return_value = True
+    return fc
+
+
+@pytest.fixture
+def fake_cuda(_session_cuda):
+    """Provide the shared ``torch.cuda`` stand-in with call history cleared."""
+    _session_cuda.reset_mock()
+    return _session_cuda
+
+
+@pytest.fixture
+def vlm_mocks(monkeypatch):
+    """Patch the Transformers entry points used by the loaders.
+
+    Returns the (processor, tokenizer, model) instances handed out by
+    ``from_pretrained``.
+    """
+    processor = MagicMock(spec=ProcessorMixin)
+    tokenizer = MagicMock(spec_set=PreTrainedTokenizerBase)
+    model = MagicMock(spec_set=GenerationMixin)
+    monkeypatch.setattr(
+        "src.vlm_loader.AutoProcessor",
+        MagicMock(from_pretrained=MagicMock(return_value=processor)),
+    )
+    monkeypatch.setattr(
+        "src.vlm_loader.AutoTokenizer",
+        MagicMock(from_pretrained=MagicMock(return_value=tokenizer)),
+    )
+    for model_sym in ("AutoModelForVision2Seq", "Qwen2VLForConditionalGeneration"):
+        monkeypatch.setattr(
+            f"src.vlm_loader.{model_sym}",
+            MagicMock(from_pretrained=MagicMock(return_value=model)),
+        )
+    return processor, tokenizer, model
+
+
 @pytest.fixture
 def vlm_config():
     """Create a basic VLM configuration for testing."""
@@ -56,6 +140,7 @@ class TestVLMConfig:
         assert config.max_memory_gb is None
         assert config.device == "cuda"
         assert config.trust_remote_code is True
+        assert config.vision_quantization == QuantizationType.EIGHT_BIT
 
     def test_custom_values(self):
         """Verify custom configuration values."""
@@ -75,65 +160,188 @@ class TestVLMConfig:
         assert config.trust_remote_code is False
 
 
-class TestLlama4MaverickLoader:
-    """Tests for Llama 4 Maverick VLM loader."""
+@pytest.fixture(
+    params=[Llama4MaverickLoader, Gemma3Loader, PixtralLargeLoader, Qwen25VLLoader],
+    ids=["llama4", "gemma3", "pixtral", "qwen25vl"],
+)
+def loader_cls(request):
+    """Parametrize over the loaders that share the processor/tokenizer/model layout."""
+    return request.param
 
-    def test_initialization(self, vlm_config):
+
+class TestTransformersVLMLoaders:
+    """Tests shared by the processor-based VLM loaders."""
+
+    def test_initialization(self, loader_cls, vlm_config):
         """Verify loader initializes with correct configuration."""
-        loader = Llama4MaverickLoader(vlm_config)
+        loader = loader_cls(vlm_config)
         assert loader.config == vlm_config
         assert loader.model is None
         assert loader.processor is None
         assert loader.tokenizer is None
 
-    @patch("src.vlm_loader.AutoModelForVision2Seq")
-    @patch("src.vlm_loader.AutoProcessor")
-    @patch("src.vlm_loader.AutoTokenizer")
-    def test_load_with_transformers(self, mock_tokenizer, mock_processor, mock_model, vlm_config):
+    @pytest.mark.parametrize(
+        ("loader_cls", "model_sym"),
+        [
+            (Llama4MaverickLoader, "AutoModelForVision2Seq"),
+            (Gemma3Loader, "AutoModelForVision2Seq"),
+            (PixtralLargeLoader, "AutoModelForVision2Seq"),
+            (Qwen25VLLoader, "Qwen2VLForConditionalGeneration"),
+        ],
+        ids=["llama4", "gemma3", "pixtral", "qwen25vl"],
+    )
+    def test_load_with_transformers(self, loader_cls, model_sym, vlm_config):
         """Test loading model with HuggingFace Transformers."""
-        mock_processor_instance = MagicMock()
-        mock_tokenizer_instance = MagicMock()
-        mock_model_instance = MagicMock()
+        with (
+            patch(
+                f"src.vlm_loader.{model_sym}.from_pretrained",
+                return_value=MagicMock(spec=GenerationMixin),
+            ) as mock_model,
+            patch(
+                "src.vlm_loader.AutoProcessor.from_pretrained",
+                return_value=MagicMock(spec=ProcessorMixin),
+            ) as mock_processor,
+            patch(
+                "src.vlm_loader.AutoTokenizer.from_pretrained",
+                return_value=MagicMock(spec=PreTrainedTokenizerBase),
+            ) as mock_tokenizer,
+        ):
+            loader = loader_cls(vlm_config)
+            loader.load()
+
+        assert loader.processor == mock_processor.return_value
+        assert loader.tokenizer == mock_tokenizer.return_value
+        assert loader.model == mock_model.return_value
+
+        mock_processor.assert_called_once_with("test-model", trust_remote_code=True)
+        mock_tokenizer.assert_called_once_with("test-model", trust_remote_code=True)
+        assert mock_model.call_args.kwargs.get("attn_implementation") in (
+            None,
+            "flash_attention_2",
+        )
 
-        mock_processor.from_pretrained.return_value = mock_processor_instance
-        mock_tokenizer.from_pretrained.return_value = mock_tokenizer_instance
-        mock_model.from_pretrained.return_value = mock_model_instance
+    @pytest.mark.parametrize(
+        ("loader_cls", "model_sym"),
+        [
+            (Llama4MaverickLoader, "AutoModelForVision2Seq"),
+            (Gemma3Loader, "AutoModelForVision2Seq"),
+            (Qwen25VLLoader, "Qwen2VLForConditionalGeneration"),
+        ],
+        ids=["llama4", "gemma3", "qwen25vl"],
+    )
+    def test_load_uses_flash_attention_2(self, loader_cls, model_sym):
+        """Test FlashAttention-2 is requested on Ampere or newer GPUs with flash-attn."""
+        config = VLMConfig(
+            model_id="test-model",
+            quantization=QuantizationType.NONE,
+            framework=InferenceFramework.TRANSFORMERS,
+            device="cuda:1",
+        )
+        with (
+            patch("src.vlm_loader.torch.cuda.is_available", return_value=True),
+            patch(
+                "src.vlm_loader.torch.cuda.get_device_capability", return_value=(9, 0)
+            ) as mock_capability,
+            patch("src.vlm_loader.is_flash_attn_2_available", return_value=True),
+            patch("src.vlm_loader.torch.cuda.Stream"),
+            patch(f"src.vlm_loader.{model_sym}.from_pretrained") as mock_model,
+            patch("src.vlm_loader.AutoProcessor.from_pretrained"),
+            patch("src.vlm_loader.AutoTokenizer.from_pretrained"),
+        ):
+            loader_cls(config).load()
+
+        assert mock_model.call_args.kwargs["attn_implementation"] == "flash_attention_2"
+        mock_capability.assert_called_once_with(torch.device("cuda:1"))
+
+    def test_load_falls_back_to_sdpa_without_flash_attn(self):
+        """Test Ampere GPUs use SDPA when flash-attn is not installed."""
+        config = VLMConfig(
+            model_id="test-model",
+            quantization=QuantizationType.NONE,
+            framework=InferenceFramework.TRANSFORMERS,
+            device="cuda",
+        )
+        with (
+            patch("src.vlm_loader.torch.cuda.is_available", return_value=True),
+            patch("src.vlm_loader.torch.cuda.get_device_capability", return_value=(8, 0)),
+            patch("src.vlm_loader.is_flash_attn_2_available", return_value=False),
+            patch("src.vlm_loader.AutoModelForVision2Seq.from_pretrained") as mock_model,
+            patch("src.vlm_loader.AutoProcessor.from_pretrained"),
+            patch("src.vlm_loader.AutoTokenizer.from_pretrained"),
+        ):
+            Gemma3Loader(config).load()
+
+        assert mock_model.call_args.kwargs["attn_implementation"] == "sdpa"
+
+    def test_load_skips_flash_attention_2_on_older_gpus(self):
+        """Test pre-Ampere GPUs keep the default attention implementation."""
+        config = VLMConfig(
+            model_id="test-model",
+            quantization=QuantizationType.NONE,
+            framework=InferenceFramework.TRANSFORMERS,
+            device="cuda",
+        )
+        with (
+            patch("src.vlm_loader.torch.cuda.is_available", return_value=True),
+            patch("src.vlm_loader.torch.cuda.get_device_capability", return_value=(7, 5)),
+            patch("src.vlm_loader.is_flash_attn_2_available", return_value=True),
+            patch("src.vlm_loader.AutoModelForVision2Seq.from_pretrained") as mock_model,
+            patch("src.vlm_loader.AutoProcessor.from_pretrained"),
+            patch("src.vlm_loader.AutoTokenizer.from_pretrained"),
+        ):
+            Gemma3Loader(config).load()
+
+        assert "attn_implementation" not in mock_model.call_args.kwargs
+
+    def test_load_skips_flash_attention_2_on_cpu_device(self, vlm_config):
+        """Test a CPU device ignores the capability of any visible GPU."""
+        with (
+            patch("src.vlm_loader.torch.cuda.is_available", return_value=True),
+            patch("src.vlm_loader.torch.cuda.get_device_capability", return_value=(9, 0)),
+            patch("src.vlm_loader.is_flash_attn_2_available", return_value=True),
+            patch("src.vlm_loader.AutoModelForVision2Seq.from_pretrained") as mock_model,
+            patch("src.vlm_loader.AutoProcessor.from_pretrained"),
+            patch("src.vlm_loader.AutoTokenizer.from_pretrained"),
+        ):
+            Llama4MaverickLoader(vlm_config).load()
+
+        assert "attn_implementation" not in mock_model.call_args.kwargs
 
-        loader = Llama4MaverickLoader(vlm_config)
-        loader.load()
 
-        assert loader.processor == mock_processor_instance
-        assert loader.tokenizer == mock_tokenizer_instance
-        assert loader.model == mock_model_instance
+class TestLlama4MaverickLoader:
+    """Tests for Llama 4 Maverick VLM loader."""
 
-        mock_processor.from_pretrained.assert_called_once_with("test-model", trust_remote_code=True)
-        mock_tokenizer.from_pretrained.assert_called_once_with("test-model", trust_remote_code=True)
+    def test_tokenizer_cached_between_loaders(self, vlm_mocks, vlm_config, monkeypatch):
+        """Test loaders sharing a model_id reuse the tokenizer and processor."""
+        mock_tokenizer = MagicMock(from_pretrained=MagicMock(return_value=vlm_mocks[1]))
+        monkeypatch.setattr("src.vlm_loader.AutoTokenizer", mock_tokenizer)
+
+        first = Llama4MaverickLoader(vlm_config)
+        second = Llama4MaverickLoader(vlm_config)
+        first.load()
+        second.load()
+
+        assert mock_tokenizer.from_pretrained.call_count == 1
+        assert first.tokenizer is second.tokenizer
+        assert first.processor is second.processor
 
-    @patch("src.vlm_loader.AutoModelForVision2Seq")
-    @patch("src.vlm_loader.AutoProcessor")
-    @patch("src.vlm_loader.AutoTokenizer")
     def test_generate_with_transformers(
         self,
-        mock_tokenizer_cls,
-        mock_processor_cls,
-        mock_model_cls,
+        vlm_mocks,
         vlm_config,
         sample_images,
+        fake_pixel_values,
+        fake_input_ids,
+        fake_generated_ids,
     ):
         """Test text generation with Transformers framework."""
-        mock_processor = MagicMock()
-        mock_tokenizer = MagicMock()
-        mock_model = MagicMock()
-
-        mock_processor_cls.from_pretrained.return_value = mock_processor
-        mock_tokenizer_cls.from_pretrained.return_value = mock_tokenizer
-        mock_model_cls.from_pretrained.return_value = mock_model
+        mock_processor, mock_tokenizer, mock_model = vlm_mocks
 
         mock_processor.return_value = {
-            "pixel_values": torch.randn(1, 3, 224, 224),
-            "input_ids": torch.randint(0, 1000, (1, 10)),
+            "pixel_values": fake_pixel_values,
+            "input_ids": fake_input_ids,
         }
-        mock_model.generate.return_value = torch.tensor([[1, 2, 3, 4]])
+        mock_model.generate.return_value = fake_generated_ids
         mock_tokenizer.decode.return_value = "Generated text response"
 
         loader = Llama4MaverickLoader(vlm_config)
@@ -147,6 +355,137 @@ class TestLlama4MaverickLoader:
         mock_model.generate.assert_called_once()
         mock_tokenizer.decode.assert_called_once()
 
+    def test_generate_stream(self, vlm_mocks, vlm_config, sample_images, fake_input_ids):
+        """Test streaming generation yields streamer chunks from a worker thread."""
+        mock_processor, _, mock_model = vlm_mocks
+        mock_processor.return_value = {"input_ids": fake_input_ids}
+
+        loader = Llama4MaverickLoader(vlm_config)
+        loader.load()
+
+        with (
+            patch("src.vlm_loader.TextIteratorStreamer") as mock_streamer_cls,
+            patch("src.vlm_loader.threading.Thread") as mock_thread_cls,
+        ):
+            mock_streamer_cls.return_value.__iter__.return_value = iter(["a", "b", "c"])
+
+            chunks = list(loader.generate_stream(sample_images, "What is in this image?"))
+
+        assert chunks == ["a", "b", "c"]
+        mock_thread_cls.return_value.start.assert_called_once()
+        mock_thread_cls.return_value.join.assert_called_once()
+        mock_model.generate.assert_not_called()
+
+        mock_thread_cls.call_args.kwargs["target"]()
+        mock_model.generate.assert_called_once()
+        assert mock_model.generate.call_args.kwargs["streamer"] is mock_streamer_cls.return_value
+
+    def test_generate_stream_propagates_generation_error(
+        self, vlm_mocks, vlm_config, sample_images, fake_input_ids
+    ):
+        """Test a failing worker ends the stream and re-raises instead of hanging."""
+        mock_processor, _, mock_model = vlm_mocks
+        mock_processor.return_value = {"input_ids": fake_input_ids}
+        mock_model.generate.side_effect = ValueError("CUDA out of memory")
+
+        loader = Llama4MaverickLoader(vlm_config)
+        loader.load()
+
+        with pytest.raises(RuntimeError, match="CUDA out of memory"):
+            list(loader.generate_stream(sample_images, "What is in this image?"))
+
+    def test_generate_stream_close_stops_generation(
+        self, vlm_mocks, vlm_config, sample_images, fake_input_ids
+    ):
+        """Test closing the stream early stops the worker through its stopping criteria."""
+        mock_processor, _, mock_model = vlm_mocks
+        mock_processor.return_value = {"input_ids": fake_input_ids}
+        finished = threading.Event()
+
+        def fake_generate(**kwargs):
+            streamer = kwargs["streamer"]
+            while not kwargs["stopping_criteria"](fake_input_ids, None).all():
+                streamer.on_finalized_text("chunk")
+                time.sleep(0.001)
+            streamer.end()
+            finished.set()
+
+        mock_model.generate.side_effect = fake_generate
+
+        loader = Llama4MaverickLoader(vlm_config)
+        loader.load()
+
+        stream = loader.generate_stream(sample_images, "What is in this image?")
+        assert next(stream) == "chunk"
+        stream.close()
+
+        assert finished.is_set()
+
+    def test_generate_stream_without_loading_raises_error(self, vlm_config, sample_images):
+        """Verify streaming fails if model not loaded."""
+        loader = Llama4MaverickLoader(vlm_config)
+
+        with pytest.raises(RuntimeError, match="Model not loaded"):
+            next(loader.generate_stream(sample_images, "test prompt"))
+
+    def test_generate_uses_separate_stream(self, vlm_mocks, sample_images):
+        """Test inputs are copied on a dedicated stream when running on GPU."""
+        mock_processor, mock_tokenizer, mock_model = vlm_mocks
+        input_ids = MagicMock()
+        mock_processor.return_value = {"input_ids": input_ids}
+        mock_tokenizer.decode.return_value = "Generated text response"
+        config = VLMConfig(
+            model_id="test-model",
+            quantization=QuantizationType.NONE,
+            framework=InferenceFramework.TRANSFORMERS,
+            device="cuda",
+        )
+
+        with (
+            patch("src.vlm_loader.torch.cuda.is_available", return_value=True),
+            patch("src.vlm_loader.torch.cuda.get_device_capability", return_value=(7, 5)),
+            patch("src.vlm_loader.torch.cuda.Stream") as mock_stream_cls,
+            patch("src.vlm_loader.torch.cuda.stream") as mock_stream_ctx,
+            patch("src.vlm_loader.torch.cuda.current_stream") as mock_current_stream,
+        ):
+            loader = Llama4MaverickLoader(config)
+            loader.load()
+            result = loader.generate(sample_images, "What is in this image?")
+
+        assert result == "Generated text response"
+        mock_stream_cls.assert_called_once_with(device="cuda")
+        mock_stream_ctx.assert_called_once_with(mock_stream_cls.return_value)
+        mock_stream_ctx.return_value.__enter__.assert_called_once()
+        mock_current_stream.return_value.wait_stream.assert_called_once_with(
+            mock_stream_cls.return_value
+        )
+        input_ids.pin_memory.return_value.to.assert_called_once_with("cuda", non_blocking=True)
+        moved = input_ids.pin_memory.return_value.to.return_value
+        moved.record_stream.assert_called_once_with(mock_current_stream.return_value)
+
+        loader.unload()
+        assert loader._preproc_stream is None
+
+    def test_no_input_stream_for_vllm_backend(self, sample_images):
+        """Test the input-copy stream is only created for the Transformers backend."""
+        config = VLMConfig(
+            model_id="test-model",
+            quantization=QuantizationType.NONE,
+            framework=InferenceFramework.VLLM,
+            device="cuda",
+        )
+
+        with (
+            patch("src.vlm_loader.torch.cuda.is_available", return_value=True),
+            patch("src.vlm_loader.torch.cuda.Stream") as mock_stream_cls,
+            patch.object(Llama4MaverickLoader, "_load_with_vllm"),
+        ):
+            loader = Llama4MaverickLoader(config)
+            loader.load()
+
+        mock_stream_cls.assert_not_called()
+        assert loader._preproc_stream is None
+
     def test_generate_without_loading_raises_error(self, vlm_config, sample_images):
         """Verify generation fails if model not loaded."""
         loader = Llama4MaverickLoader(vlm_config)
@@ -154,23 +493,33 @@ class TestLlama4MaverickLoader:
         with pytest.raises(RuntimeError, match="Model not loaded"):
             loader.generate(sample_images, "test prompt")
 
-    @patch("src.vlm_loader.torch.cuda")
-    def test_unload_clears_memory(self, mock_cuda, vlm_config):
+    def test_unload_clears_memory(self, fake_cuda, monkeypatch, vlm_config):
         """Test that unload properly clears model from memory."""
-        mock_cuda.is_available.return_value = True
-        mock_cuda.empty_cache = MagicMock()
+        monkeypatch.setattr("src.vlm_loader.torch.cuda", fake_cuda)
 
         loader = Llama4MaverickLoader(vlm_config)
         loader.model = MagicMock()
         loader.processor = MagicMock()
         loader.tokenizer = MagicMock()
 
-        loader.unload()
+        loader.unload(release_to_os=True)
 
         assert loader.model is None
         assert loader.processor is None
         assert loader.tokenizer is None
-        mock_cuda.empty_cache.assert_called_once()
+        fake_cuda.empty_cache.assert_called_once()
+
+    def test_unload_keeps_allocator_pool(self, fake_cuda, monkeypatch, vlm_config):
+        """Test that unload leaves cached blocks in the allocator by default."""
+        monkeypatch.setattr("src.vlm_loader.torch.cuda", fake_cuda)
+
+        loader = Llama4MaverickLoader(vlm_config)
+        loader.model = MagicMock()
+
+        loader.unload()
+
+        assert loader.model is None
+        fake_cuda.empty_cache.assert_not_called()
 
     def test_get_quantization_config_4bit(self, vlm_config):
         """Test 4-bit quantization config generation."""
@@ -198,6 +547,87 @@ class TestLlama4MaverickLoader:
         assert quant_config.load_in_8bit is True
         assert quant_config.llm_int8_threshold == 6.0  # default bitsandbytes value
 
+    def test_quantization_config_is_singleton(self, vlm_config):
+        """Test loaders reuse one config object per quantization type."""
+        loader = Gemma3Loader(vlm_config)
+        other = PixtralLargeLoader(vlm_config)
+
+        assert loader._get_quantization_config() is loader._get_quantization_config()
+        assert loader._get_quantization_config() is other._get_quantization_config()
+
+    @pytest.mark.parametrize(
+        "loader_cls",
+        [Gemma3Loader, InternVL3Loader, PixtralLargeLoader, Qwen25VLLoader],
+        ids=["gemma3", "internvl3", "pixtral", "qwen25vl"],
+    )
+    def test_other_loaders_quantize_vision_tower_as_nf4(self, loader_cls, vlm_config):
+        """Test only Llama 4 Maverick leaves its vision encoder out of the NF4 pass."""
+        quant_config = loader_cls(vlm_config)._get_quantization_config()
+
+        assert quant_config.load_in_4bit is True
+        assert not quant_config.llm_int8_skip_modules
+
+    def test_vision_tower_kept_at_int8(self, vlm_config):
+        """Test the NF4 pass leaves the vision encoder for separate int8 quantization."""
+        loader = Llama4MaverickLoader(vlm_config)
+        quant_config = loader._get_quantization_config()
+
+        assert quant_config.load_in_4bit is True
+        assert "vision_model" in quant_config.llm_int8_skip_modules
+        assert "multi_modal_projector" in quant_config.llm_int8_skip_modules
+        assert "language_model" not in quant_config.llm_int8_skip_modules
+
+    def test_vision_tower_nf4_when_requested(self):
+        """Test the vision encoder joins the NF4 pass when configured at 4-bit."""
+        config = VLMConfig(
+            model_id="test-model",
+            quantization=QuantizationType.FOUR_BIT,
+            framework=InferenceFramework.TRANSFORMERS,
+            device="cpu",
+            vision_quantization=QuantizationType.FOUR_BIT,
+        )
+        quant_config = Llama4MaverickLoader(config)._get_quantization_config()
+
+        assert not quant_config.llm_int8_skip_modules
+
+    def test_load_quantizes_vision_tower_on_gpu(self, vlm_mocks, vlm_config):
+        """Test loading on GPU converts the vision encoder to int8."""
+        _, _, mock_model = vlm_mocks
+
+        with (
+            patch("src.vlm_loader.torch.cuda.is_available", return_value=True),
+            patch("src.vlm_loader.torch.cuda.get_device_capability", return_value=(7, 5)),
+            patch("src.vlm_loader._quantize_vision_int8") as mock_quantize,
+        ):
+            Llama4MaverickLoader(vlm_config).load()
+
+        mock_quantize.assert_called_once_with(mock_model)
+
+    @pytest.mark.parametrize(
+        "device",
+        [
+            "cpu",
+            pytest.param(
+                "cuda",
+                marks=pytest.mark.skipif(not torch.cuda.is_available(), reason="needs CUDA"),
+            ),
+        ],
+    )
+    def test_replace_linear_int8_quantizes_weights(self, device):
+        """Test vision linears become int8 weights with row scales, not copied floats."""
+        pytest.importorskip("bitsandbytes")
+
+        encoder = torch.nn.Sequential(torch.nn.Linear(16, 8), torch.nn.ReLU())
+        encoder.to(device=device, dtype=torch.bfloat16)
+
+        _replace_linear_int8(encoder)
+
+        weight = encoder[0].weight
+        assert weight.dtype == torch.int8
+        assert weight.SCB is not None
+        assert weight.SCB.shape == (8,)
+        assert weight.device.type == device
+
     def test_get_quantization_config_none(self):
         """Test no quantization returns None config."""
         config = VLMConfig(
@@ -212,36 +642,6 @@ class TestLlama4MaverickLoader:
         assert quant_config is None
 
 
-class TestGemma3Loader:
-    """Tests for Gemma 3 VLM loader."""
-
-    def test_initialization(self, vlm_config):
-        """Verify loader initializes correctly."""
-        loader = Gemma3Loader(vlm_config)
-        assert loader.config == vlm_config
-        assert loader.model is None
-
-    @patch("src.vlm_loader.AutoModelForVision2Seq.from_pretrained")
-    @patch("src.vlm_loader.AutoProcessor.from_pretrained")
-    @patch("src.vlm_loader.AutoTokenizer.from_pretrained")
-    def test_load_with_transformers(self, mock_tokenizer, mock_processor, mock_model, vlm_config):
-        """Test loading Gemma 3 with Transformers."""
-        mock_processor_instance = MagicMock()
-        mock_tokenizer_instance = MagicMock()
-        mock_model_instance = MagicMock()
-
-        mock_processor.return_value = mock_processor_instance
-        mock_tokenizer.return_value = mock_tokenizer_instance
-        mock_model.return_value = mock_model_instance
-
-        loader = Gemma3Loader(vlm_config)
-        loader.load()
-
-        assert loader.model == mock_model_instance
-        assert loader.processor == mock_processor_instance
-        assert loader.tokenizer == mock_tokenizer_instance
-
-
 class TestInternVL3Loader:
     """Tests for InternVL3 VLM loader."""
 
@@ -269,7 +669,9 @@ class TestInternVL3Loader:
 
     @patch("src.vlm_loader.AutoModel.from_pretrained")
     @patch("src.vlm_loader.AutoTokenizer.from_pretrained")
-    def test_generate(self, mock_tokenizer_cls, mock_model_cls, vlm_config, sample_images):
+    def test_generate(
+        self, mock_tokenizer_cls, mock_model_cls, vlm_config, sample_images, fake_pixel_values
+    ):
         """Test text generation with InternVL3."""
         mock_tokenizer = MagicMock()
         mock_model = MagicMock()
@@ -277,9 +679,9 @@ class TestInternVL3Loader:
         mock_tokenizer_cls.return_value = mock_tokenizer
         mock_model_cls.return_value = mock_model
 
-        # Mock the chained calls: load_image().to().cuda()
+        # On CPU the pixel values are converted in place without pinning
         mock_pixel_values = MagicMock()
-        mock_pixel_values.to.return_value.cuda.return_value = torch.randn(1, 3, 224, 224)
+        mock_pixel_values.to.return_value = fake_pixel_values
         mock_model.load_image.return_value = mock_pixel_values
         mock_model.chat.return_value = "InternVL3 response"
 
@@ -290,93 +692,61 @@ class TestInternVL3Loader:
 
         assert result == "InternVL3 response"
         mock_model.chat.assert_called_once()
+        mock_pixel_values.pin_memory.assert_not_called()
+        mock_pixel_values.to.assert_called_once_with("cpu", dtype=torch.bfloat16)
 
-
-class TestPixtralLargeLoader:
-    """Tests for Pixtral Large VLM loader."""
-
-    def test_initialization(self, vlm_config):
-        """Verify loader initializes correctly."""
-        loader = PixtralLargeLoader(vlm_config)
-        assert loader.config == vlm_config
-        assert loader.model is None
-
-    @patch("src.vlm_loader.AutoModelForVision2Seq.from_pretrained")
-    @patch("src.vlm_loader.AutoProcessor.from_pretrained")
+    @patch("src.vlm_loader.AutoModel.from_pretrained")
     @patch("src.vlm_loader.AutoTokenizer.from_pretrained")
-    def test_load_with_transformers(self, mock_tokenizer, mock_processor, mock_model, vlm_config):
-        """Test loading Pixtral Large with Transformers."""
-        mock_processor_instance = MagicMock()
-        mock_tokenizer_instance = MagicMock()
-        mock_model_instance = MagicMock()
+    def test_generate_pins_pixel_values_on_cuda(
+        self, mock_tokenizer_cls, mock_model_cls, sample_images, fake_pixel_values
+    ):
+        """Test pixel values are pinned and copied asynchronously to a CUDA device."""
+        mock_model = MagicMock()
+        mock_model_cls.return_value = mock_model
 
-        mock_processor.return_value = mock_processor_instance
-        mock_tokenizer.return_value = mock_tokenizer_instance
-        mock_model.return_value = mock_model_instance
+        # Mock the chained calls: load_image().pin_memory().to()
+        mock_pixel_values = MagicMock()
+        mock_pixel_values.pin_memory.return_value.to.return_value = fake_pixel_values
+        mock_model.load_image.return_value = mock_pixel_values
+        mock_model.chat.return_value = "InternVL3 response"
 
-        loader = PixtralLargeLoader(vlm_config)
+        config = VLMConfig(
+            model_id="test-model",
+            quantization=QuantizationType.NONE,
+            framework=InferenceFramework.TRANSFORMERS,
+            device="cuda",
+        )
+        loader = InternVL3Loader(config)
         loader.load()
 
-        assert loader.model == mock_model_instance
-        assert loader.processor == mock_processor_instance
-        assert loader.tokenizer == mock_tokenizer_instance
+        assert loader.generate(sample_images, "Describe this image") == "InternVL3 response"
+        mock_pixel_values.pin_memory.assert_called_once()
+        mock_pixel_values.pin_memory.return_value.to.assert_called_once_with(
+            "cuda", dtype=torch.bfloat16, non_blocking=True
+        )
 
 
 class TestQwen25VLLoader:
     """Tests for Qwen2.5-VL VLM loader."""
 
-    def test_initialization(self, vlm_config):
-        """Verify loader initializes correctly."""
-        loader = Qwen25VLLoader(vlm_config)
-        assert loader.config == vlm_config
-        assert loader.model is None
-
-    @patch("src.vlm_loader.Qwen2VLForConditionalGeneration")
-    @patch("src.vlm_loader.AutoProcessor")
-    @patch("src.vlm_loader.AutoTokenizer")
-    def test_load_with_transformers(self, mock_tokenizer, mock_processor, mock_model, vlm_config):
-        """Test loading Qwen2.5-VL with Transformers."""
-        mock_processor_instance = MagicMock()
-        mock_tokenizer_instance = MagicMock()
-        mock_model_instance = MagicMock()
-
-        mock_processor.from_pretrained.return_value = mock_processor_instance
-        mock_tokenizer.from_pretrained.return_value = mock_tokenizer_instance
-        mock_model.from_pretrained.return_value = mock_model_instance
-
-        loader = Qwen25VLLoader(vlm_config)
-        loader.load()
-
-        assert loader.model == mock_model_instance
-        assert loader.processor == mock_processor_instance
-        assert loader.tokenizer == mock_tokenizer_instance
-
-    @patch("src.vlm_loader.Qwen2VLForConditionalGeneration")
-    @patch("src.vlm_loader.AutoProcessor")
-    @patch("src.vlm_loader.AutoTokenizer")
     def test_generate_with_transformers(
         self,
-        mock_tokenizer_cls,
-        mock_processor_cls,
-        mock_model_cls,
+        vlm_mocks,
         vlm_config,
         sample_images,
+        fake_input_ids,
+        fake_generated_ids,
     ):
         """Test text generation with Qwen2.5-VL."""
-        mock_processor = MagicMock()
-        mock_tokenizer = MagicMock()
-        mock_model = MagicMock()
-
-        mock_processor_cls.from_pretrained.return_value = mock_processor
-        mock_tokenizer_cls.from_pretrained.return_value = mock_tokenizer
-        mock_model_cls.from_pretrained.return_value = mock_model
+        mock_processor, mock_tokenizer, mock_model = vlm_mocks
 
         mock_processor.apply_chat_template.return_value = "formatted prompt"
-        mock_processor.process_vision_info.return_value = ([sample_images[0]], None)
+        # process_vision_info comes from qwen_vl_utils, so it is not part of the spec
+        mock_processor.process_vision_info = MagicMock(return_value=([sample_images[0]], None))
         mock_processor.return_value = {
-            "input_ids": torch.randint(0, 1000, (1, 10)),
+            "input_ids": fake_input_ids,
         }
-        mock_model.generate.return_value = torch.tensor([[1, 2, 3, 4]])
+        mock_model.generate.return_value = fake_generated_ids
         mock_tokenizer.decode.return_value = "Qwen2.5-VL response"
 
         loader = Qwen25VLLoader(vlm_config)
@@ -453,6 +823,27 @@ class TestCreateVLMLoader:
         loader = create_vlm_loader("llama_4_maverick", vlm_config)
         assert isinstance(loader, Llama4MaverickLoader)
 
+    def test_create_loader_with_config_option_names(self, vlm_config):
+        """Test factory function accepts the option keys used in models.yaml."""
+        assert isinstance(create_vlm_loader("qwen-2-5-vl-7b", vlm_config), Qwen25VLLoader)
+        assert isinstance(create_vlm_loader("qwen2-5-vl-72b", vlm_config), Qwen25VLLoader)
+        assert isinstance(create_vlm_loader("gemma-3-27b-it", vlm_config), Gemma3Loader)
+
+    @pytest.mark.parametrize(
+        ("model_id", "loader_cls"),
+        [
+            ("meta-llama/Llama-4-Maverick", Llama4MaverickLoader),
+            ("google/gemma-3-27b-it", Gemma3Loader),
+            ("OpenGVLab/InternVL3-78B", InternVL3Loader),
+            ("mistralai/Pixtral-Large-Instruct-2411", PixtralLargeLoader),
+            ("Qwen/Qwen2.5-VL-7B-Instruct", Qwen25VLLoader),
+            ("Qwen/Qwen2.5-VL-72B-Instruct", Qwen25VLLoader),
+        ],
+    )
+    def test_create_loader_with_hf_model_ids(self, vlm_config, model_id, loader_cls):
+        """Test factory function accepts the full model ids used in models.yaml."""
+        assert isinstance(create_vlm_loader(model_id, vlm_config), loader_cls)
+
     def test_create_loader_unknown_model_raises_error(self, vlm_config):
         """Test factory function raises error for unknown model."""
         with pytest.raises(ValueError, match="Unknown model name"):
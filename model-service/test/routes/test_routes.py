@@ -5,63 +5,118 @@ This module contains tests for the video summarization, ontology augmentation,
 and object detection endpoints.
 """
 
+import functools
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock, patch
 
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
-
-from src.main import app
-from src.models import OntologyType, SummarizeResponse
+from httpx import Response
+from pydantic import ValidationError
+
+import src.routes
+from src.detection_loader import DetectionResult
+from src.model_manager import TaskConfig
+from src.models import DetectionRequest, OntologyType, SummarizeRequest, SummarizeResponse
+from src.tracking_loader import TrackingFrame, TrackingMask, TrackingResult
+
+try:
+    from orjson import dumps as _json_dumps
+except ImportError:
+    from json import dumps as _json_dumps  # type: ignore[assignment]
+
+try:
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# Detection loader output with no objects; routes only read it, so tests share one
+EMPTY_DETECTION = DetectionResult(
+    detections=[], image_width=1920, image_height=1080, processing_time=0.1
+)
+
+
+def _post_json(client: TestClient, url: str, payload: dict) -> Response:
+    """POST a JSON body, encoded with orjson when available (mask payloads run to MBs)."""
+    return client.post(url, content=_json_dumps(payload), headers=_JSON_HEADERS)
+
+
+@functools.cache
+def _blank_frame(height: int, width: int) -> np.ndarray:
+    """Read-only black BGR frame, shared between tests since routes only read it."""
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    frame.setflags(write=False)
+    return frame
+
+
+@functools.cache
+def _mask(height: int, width: int, value: int = 1) -> np.ndarray:
+    """Read-only uint8 mask filled with ``value``."""
+    mask = np.full((height, width), value, dtype=np.uint8)
+    mask.setflags(write=False)
+    return mask
+
+
+@functools.cache
+def _mask_b64(height: int, width: int, value: int = 1) -> str:
+    """Base64 encoding of ``_mask``, as sent in tracking requests."""
+    # Encode straight from the array's buffer rather than a tobytes() copy
+    return b64encode(memoryview(_mask(height, width, value)).cast("B")).decode("utf-8")
+
+
+def _ones_rle(height: int, width: int) -> dict:
+    """Uncompressed RLE of an all-ones mask: no leading zeros, then one run of ones."""
+    return {"size": [height, width], "counts": [0, height * width]}
+
+
+def _mock_video_capture(
+    fps: float = 30.0, frame_count: int = 100, width: int = 0, height: int = 0
+) -> Mock:
+    """Build a cv2.VideoCapture mock reporting the given properties."""
+    # cv2.CAP_PROP_FRAME_WIDTH, FRAME_HEIGHT, FPS, FRAME_COUNT; other properties read as 0
+    props = {3: width, 4: height, 5: fps, 7: frame_count}
+    cap = Mock()
+    cap.get.side_effect = lambda prop: props.get(prop, 0)
+    cap.read.return_value = (True, _blank_frame(height or 480, width or 640))
+    cap.set.return_value = True
+    return cap
+
+
+# Models the mocked model manager exposes per task: (selected, model_id, quantization, framework)
+_TASK_MODELS = {
+    "video_summarization": ("llama-4-maverick", "meta-llama/Llama-4-Maverick", "4bit", "sglang"),
+    "object_detection": ("yolo-world-v2", "ultralytics/yolov8x-worldv2", None, "ultralytics"),
+    "ontology_augmentation": ("llama-4-scout", "meta-llama/Llama-4-Scout", "4bit", "sglang"),
+    "video_tracking": ("samurai", "yangchris11/samurai", None, "pytorch"),
+}
+
+# Routes only read task configs, so they are built once; each test's manager gets its own dict
+TASK_CONFIGS = {
+    task: TaskConfig(
+        task,
+        {
+            "selected": selected,
+            "options": {
+                selected: {
+                    "model_id": model_id,
+                    "quantization": quantization,
+                    "framework": framework,
+                }
+            },
+        },
+    )
+    for task, (selected, model_id, quantization, framework) in _TASK_MODELS.items()
+}
 
 
 @pytest.fixture(autouse=True)
 def mock_model_manager() -> Mock:
     """Mock the global model manager for all tests."""
     mock_manager = Mock()
-
-    # Video summarization task config
-    mock_task_config = Mock()
-    mock_task_config.selected = "llama-4-maverick"
-    mock_model_config = Mock()
-    mock_model_config.model_id = "meta-llama/Llama-4-Maverick"
-    mock_model_config.quantization = "4bit"
-    mock_model_config.framework = "sglang"
-    mock_task_config.get_selected_config.return_value = mock_model_config
-
-    # Object detection task config
-    mock_detection_task = Mock()
-    mock_detection_task.selected = "yolo-world-v2"
-    mock_detection_config = Mock()
-    mock_detection_config.model_id = "ultralytics/yolov8x-worldv2"
-    mock_detection_config.quantization = None
-    mock_detection_config.framework = "ultralytics"
-    mock_detection_task.get_selected_config.return_value = mock_detection_config
-
-    # Ontology augmentation task config
-    mock_augment_task = Mock()
-    mock_augment_task.selected = "llama-4-scout"
-    mock_augment_config = Mock()
-    mock_augment_config.model_id = "meta-llama/Llama-4-Scout"
-    mock_augment_config.quantization = "4bit"
-    mock_augment_config.framework = "sglang"
-    mock_augment_task.get_selected_config.return_value = mock_augment_config
-
-    # Video tracking task config
-    mock_tracking_task = Mock()
-    mock_tracking_task.selected = "samurai"
-    mock_tracking_config = Mock()
-    mock_tracking_config.model_id = "yangchris11/samurai"
-    mock_tracking_config.quantization = None
-    mock_tracking_config.framework = "pytorch"
-    mock_tracking_task.get_selected_config.return_value = mock_tracking_config
-
-    mock_manager.tasks = {
-        "video_summarization": mock_task_config,
-        "object_detection": mock_detection_task,
-        "ontology_augmentation": mock_augment_task,
-        "video_tracking": mock_tracking_task,
-    }
+    mock_manager.tasks = dict(TASK_CONFIGS)
 
     # Mock is_external_api to return False (use self-hosted models in tests)
     mock_manager.is_external_api.return_value = False
@@ -70,13 +125,11 @@ def mock_model_manager() -> Mock:
 
 
 @pytest.fixture
-def test_client_with_mocks(mock_model_manager: Mock) -> TestClient:
-    """Test client fixture for API requests with mocked model manager."""
+def test_client_with_mocks(client: TestClient, mock_model_manager: Mock) -> TestClient:
+    """Shared test client with the mocked model manager installed."""
     # Replace the model manager that was set during app startup with our mock
-    import src.routes
-
     src.routes._model_manager = mock_model_manager
-    return TestClient(app, base_url="http://testserver")
+    return client
 
 
 class TestSummarizeEndpoint:
@@ -169,18 +222,16 @@ class TestSummarizeEndpoint:
 
         assert response.status_code == 422
 
-    def test_summarize_video_invalid_frame_rate(self, test_client_with_mocks: TestClient) -> None:
-        """Test summarization with invalid frame sample rate."""
-        response = test_client_with_mocks.post(
-            "/api/summarize",
-            json={
-                "video_id": "test-video-123",
-                "persona_id": "test-persona-456",
-                "frame_sample_rate": 20,  # Exceeds max of 10
-            },
-        )
-
-        assert response.status_code == 422
+    def test_summarize_video_invalid_frame_rate(self) -> None:
+        """Test summarization request validation rejects an invalid frame sample rate."""
+        with pytest.raises(ValidationError):
+            SummarizeRequest.model_validate(
+                {
+                    "video_id": "test-video-123",
+                    "persona_id": "test-persona-456",
+                    "frame_sample_rate": 20,  # Exceeds max of 10
+                }
+            )
 
     @patch("src.video_downloader.download_video_if_needed")
     @patch("src.summarization.summarize_video_with_vlm")
@@ -466,6 +517,33 @@ class TestAugmentEndpoint:
 class TestDetectionEndpoint:
     """Tests for /api/detection/detect endpoint."""
 
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            pytest.param(
+                {
+                    "video_id": "test-video-123",
+                    "query": "person wearing red shirt",
+                    "confidence_threshold": 0.5,
+                    "enable_tracking": True,
+                },
+                id="with-tracking",
+            ),
+            pytest.param(
+                {
+                    "video_id": "test-video-456",
+                    "query": "vehicle",
+                    "frame_numbers": [0, 30, 60, 90],
+                },
+                id="specific-frames",
+            ),
+            pytest.param(
+                {"video_id": "test-video-789", "query": "animal", "enable_tracking": False},
+                id="no-tracking",
+            ),
+            pytest.param({"video_id": "test-video-678", "query": "test object"}, id="defaults"),
+        ],
+    )
     @patch("src.video_downloader.download_video_if_needed")
     @patch("cv2.VideoCapture")
     @patch("src.detection_loader.create_detection_loader")
@@ -476,134 +554,36 @@ class TestDetectionEndpoint:
         mock_create_loader: Mock,
         mock_video_capture: Mock,
         mock_download: AsyncMock,
+        payload: dict,
         test_client_with_mocks: TestClient,
     ) -> None:
-        """Test successful object detection request."""
-        mock_get_video.return_value = Path("/videos/test-video-123.mp4")
-        mock_download.return_value = ("/videos/test-video-123.mp4", False)
-
-        # Mock video capture
-        import numpy as np
+        """Test successful object detection requests and their response structure."""
+        video_path = f"/videos/{payload['video_id']}.mp4"
+        mock_get_video.return_value = Path(video_path)
+        mock_download.return_value = (video_path, False)
+        mock_video_capture.return_value = _mock_video_capture()
 
-        mock_cap = Mock()
-        mock_cap.get.side_effect = (
-            lambda prop: 30.0 if prop == 5 else 100 if prop == 7 else 0
-        )  # FPS and frame count
-        mock_cap.read.return_value = (True, np.zeros((480, 640, 3), dtype=np.uint8))
-        mock_cap.set.return_value = True
-        mock_video_capture.return_value = mock_cap
-
-        # Mock detection loader
         mock_loader = Mock()
-        mock_loader.detect.return_value = Mock(
-            detections=[], image_width=1920, image_height=1080, processing_time=0.1
-        )
+        mock_loader.detect.return_value = EMPTY_DETECTION
         mock_create_loader.return_value = mock_loader
 
-        response = test_client_with_mocks.post(
-            "/api/detection/detect",
-            json={
-                "video_id": "test-video-123",
-                "query": "person wearing red shirt",
-                "confidence_threshold": 0.5,
-                "enable_tracking": True,
-            },
-        )
+        response = test_client_with_mocks.post("/api/detection/detect", json=payload)
 
         assert response.status_code == 200
         data = response.json()
 
-        assert "id" in data
-        assert data["video_id"] == "test-video-123"
-        assert data["query"] == "person wearing red shirt"
-        assert "frames" in data
+        assert data["video_id"] == payload["video_id"]
+        assert data["query"] == payload["query"]
+        for field in ["id", "frames", "total_detections", "processing_time"]:
+            assert field in data
         assert isinstance(data["frames"], list)
-        assert "total_detections" in data
-        assert "processing_time" in data
-
-    @patch("src.video_downloader.download_video_if_needed")
-    @patch("cv2.VideoCapture")
-    @patch("src.detection_loader.create_detection_loader")
-    @patch("src.summarization.get_video_path_for_id")
-    def test_process_detection_specific_frames(
-        self,
-        mock_get_video: Mock,
-        mock_create_loader: Mock,
-        mock_video_capture: Mock,
-        mock_download: AsyncMock,
-        test_client_with_mocks: TestClient,
-    ) -> None:
-        """Test detection on specific frames."""
-        mock_get_video.return_value = Path("/videos/test-video-456.mp4")
-        mock_download.return_value = ("/videos/test-video-456.mp4", False)
-        mock_cap = Mock()
-        mock_cap.get.side_effect = lambda prop: 30.0 if prop == 5 else 100 if prop == 7 else 0
-        import numpy as np
-
-        mock_cap.read.return_value = (True, np.zeros((480, 640, 3), dtype=np.uint8))
-        mock_cap.set.return_value = True
-        mock_video_capture.return_value = mock_cap
-
-        mock_loader = Mock()
-        mock_loader.detect.return_value = Mock(
-            detections=[], image_width=1920, image_height=1080, processing_time=0.1
-        )
-        mock_create_loader.return_value = mock_loader
-
-        response = test_client_with_mocks.post(
-            "/api/detection/detect",
-            json={
-                "video_id": "test-video-456",
-                "query": "vehicle",
-                "frame_numbers": [0, 30, 60, 90],
-            },
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert data["video_id"] == "test-video-456"
-
-    @patch("src.video_downloader.download_video_if_needed")
-    @patch("cv2.VideoCapture")
-    @patch("src.detection_loader.create_detection_loader")
-    @patch("src.summarization.get_video_path_for_id")
-    def test_process_detection_no_tracking(
-        self,
-        mock_get_video: Mock,
-        mock_create_loader: Mock,
-        mock_video_capture: Mock,
-        mock_download: AsyncMock,
-        test_client_with_mocks: TestClient,
-    ) -> None:
-        """Test detection without tracking enabled."""
-        mock_get_video.return_value = Path("/videos/test-video-789.mp4")
-        mock_download.return_value = ("/videos/test-video-789.mp4", False)
-        mock_cap = Mock()
-        mock_cap.get.side_effect = lambda prop: 30.0 if prop == 5 else 100 if prop == 7 else 0
-        import numpy as np
 
-        mock_cap.read.return_value = (True, np.zeros((480, 640, 3), dtype=np.uint8))
-        mock_cap.set.return_value = True
-        mock_video_capture.return_value = mock_cap
-
-        mock_loader = Mock()
-        mock_loader.detect.return_value = Mock(
-            detections=[], image_width=1920, image_height=1080, processing_time=0.1
-        )
-        mock_create_loader.return_value = mock_loader
-
-        response = test_client_with_mocks.post(
-            "/api/detection/detect",
-            json={
-                "video_id": "test-video-789",
-                "query": "animal",
-                "enable_tracking": False,
-            },
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert data["video_id"] == "test-video-789"
+        if len(data["frames"]) > 0:
+            frame = data["frames"][0]
+            assert "frame_number" in frame
+            assert "timestamp" in frame
+            assert "detections" in frame
+            assert isinstance(frame["detections"], list)
 
     def test_process_detection_missing_query(self, test_client_with_mocks: TestClient) -> None:
         """Test detection with missing query field."""
@@ -616,76 +596,16 @@ class TestDetectionEndpoint:
 
         assert response.status_code == 422
 
-    def test_process_detection_invalid_confidence(self, test_client_with_mocks: TestClient) -> None:
-        """Test detection with invalid confidence threshold."""
-        response = test_client_with_mocks.post(
-            "/api/detection/detect",
-            json={
-                "video_id": "test-video-345",
-                "query": "test",
-                "confidence_threshold": 1.5,  # Exceeds max of 1.0
-            },
-        )
-
-        assert response.status_code == 422
-
-    @patch("src.video_downloader.download_video_if_needed")
-    @patch("cv2.VideoCapture")
-    @patch("src.detection_loader.create_detection_loader")
-    @patch("src.summarization.get_video_path_for_id")
-    def test_process_detection_response_structure(
-        self,
-        mock_get_video: Mock,
-        mock_create_loader: Mock,
-        mock_video_capture: Mock,
-        mock_download: AsyncMock,
-        test_client_with_mocks: TestClient,
-    ) -> None:
-        """Test that response contains all expected fields."""
-        mock_get_video.return_value = Path("/videos/test-video-678.mp4")
-        mock_download.return_value = ("/videos/test-video-678.mp4", False)
-        mock_cap = Mock()
-        mock_cap.get.side_effect = lambda prop: 30.0 if prop == 5 else 100 if prop == 7 else 0
-        import numpy as np
-
-        mock_cap.read.return_value = (True, np.zeros((480, 640, 3), dtype=np.uint8))
-        mock_cap.set.return_value = True
-        mock_video_capture.return_value = mock_cap
-
-        mock_loader = Mock()
-        mock_loader.detect.return_value = Mock(
-            detections=[], image_width=1920, image_height=1080, processing_time=0.1
-        )
-        mock_create_loader.return_value = mock_loader
-
-        response = test_client_with_mocks.post(
-            "/api/detection/detect",
-            json={
-                "video_id": "test-video-678",
-                "query": "test object",
-            },
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-
-        required_fields = [
-            "id",
-            "video_id",
-            "query",
-            "frames",
-            "total_detections",
-            "processing_time",
-        ]
-        for field in required_fields:
-            assert field in data
-
-        if len(data["frames"]) > 0:
-            frame = data["frames"][0]
-            assert "frame_number" in frame
-            assert "timestamp" in frame
-            assert "detections" in frame
-            assert isinstance(frame["detections"], list)
+    def test_process_detection_invalid_confidence(self) -> None:
+        """Test detection request validation rejects an invalid confidence threshold."""
+        with pytest.raises(ValidationError):
+            DetectionRequest.model_validate(
+                {
+                    "video_id": "test-video-345",
+                    "query": "test",
+                    "confidence_threshold": 1.5,  # Exceeds max of 1.0
+                }
+            )
 
     @patch("src.video_downloader.cleanup_temp_video")
     @patch("src.video_downloader.download_video_if_needed")
@@ -700,23 +620,15 @@ class TestDetectionEndpoint:
         test_client_with_mocks: TestClient,
     ) -> None:
         """Test detection with HTTP URL video path."""
-        import numpy as np
-
         # Mock download to return temp file path
         mock_download.return_value = ("/tmp/video_def456.mp4", True)
 
         # Mock video capture
-        mock_cap = Mock()
-        mock_cap.get.side_effect = lambda prop: 30.0 if prop == 5 else 100 if prop == 7 else 0
-        mock_cap.read.return_value = (True, np.zeros((480, 640, 3), dtype=np.uint8))
-        mock_cap.set.return_value = True
-        mock_video_capture.return_value = mock_cap
+        mock_video_capture.return_value = _mock_video_capture()
 
         # Mock detection loader
         mock_loader = Mock()
-        mock_loader.detect.return_value = Mock(
-            detections=[], image_width=1920, image_height=1080, processing_time=0.1
-        )
+        mock_loader.detect.return_value = EMPTY_DETECTION
         mock_create_loader.return_value = mock_loader
 
         response = test_client_with_mocks.post(
@@ -753,8 +665,6 @@ class TestDetectionEndpoint:
         test_client_with_mocks: TestClient,
     ) -> None:
         """Test detection when video_id resolves to S3 pre-signed URL."""
-        import numpy as np
-
         # Mock get_video_path_for_id to return S3 URL
         mock_get_video.return_value = "https://bucket.s3.amazonaws.com/video.mp4?signature=xyz"
 
@@ -762,17 +672,11 @@ class TestDetectionEndpoint:
         mock_download.return_value = ("/tmp/video_ghi789.mp4", True)
 
         # Mock video capture
-        mock_cap = Mock()
-        mock_cap.get.side_effect = lambda prop: 30.0 if prop == 5 else 100 if prop == 7 else 0
-        mock_cap.read.return_value = (True, np.zeros((480, 640, 3), dtype=np.uint8))
-        mock_cap.set.return_value = True
-        mock_video_capture.return_value = mock_cap
+        mock_video_capture.return_value = _mock_video_capture()
 
         # Mock detection loader
         mock_loader = Mock()
-        mock_loader.detect.return_value = Mock(
-            detections=[], image_width=1920, image_height=1080, processing_time=0.1
-        )
+        mock_loader.detect.return_value = EMPTY_DETECTION
         mock_create_loader.return_value = mock_loader
 
         response = test_client_with_mocks.post(
@@ -795,6 +699,14 @@ class TestDetectionEndpoint:
 class TestTrackingEndpoint:
     """Tests for /api/tracking/track endpoint."""
 
+    @pytest.mark.parametrize(
+        ("video_id", "fps", "frame_count", "width", "height", "object_ids", "frame_numbers"),
+        [
+            pytest.param("test-tracking-123", 30.0, 100, 640, 480, [1], [0, 10, 20], id="480p"),
+            pytest.param("wildlife-video", 30.0, 50, 1920, 1080, [1], None, id="1080p"),
+            pytest.param("sports-video", 60.0, 180, 1280, 720, [1, 2], None, id="720p-two-objects"),
+        ],
+    )
     @patch("src.video_downloader.download_video_if_needed")
     @patch("cv2.VideoCapture")
     @patch("src.tracking_loader.create_tracking_loader")
@@ -805,168 +717,120 @@ class TestTrackingEndpoint:
         mock_create_loader: Mock,
         mock_video_capture: Mock,
         mock_download: AsyncMock,
+        video_id: str,
+        fps: float,
+        frame_count: int,
+        width: int,
+        height: int,
+        object_ids: list[int],
+        frame_numbers: list[int] | None,
         test_client_with_mocks: TestClient,
     ) -> None:
-        """Test successful object tracking request with SAMURAI model."""
-        import base64
-
-        import numpy as np
-
-        mock_get_video.return_value = Path("/videos/test-tracking-123.mp4")
-        mock_download.return_value = ("/videos/test-tracking-123.mp4", False)
-
-        # Mock video capture
-        mock_cap = Mock()
-        mock_cap.get.side_effect = lambda prop: (
-            30.0
-            if prop == 5
-            else 100
-            if prop == 7
-            else 640
-            if prop == 3
-            else 480
-            if prop == 4
-            else 0
-        )
-        mock_cap.read.return_value = (True, np.zeros((480, 640, 3), dtype=np.uint8))
-        mock_cap.set.return_value = True
-        mock_video_capture.return_value = mock_cap
-
-        # Mock tracking loader
-        from src.tracking_loader import TrackingFrame, TrackingMask, TrackingResult
+        """Test successful object tracking requests across video sizes and object counts."""
+        video_path = f"/videos/{video_id}.mp4"
+        mock_get_video.return_value = Path(video_path)
+        mock_download.return_value = (video_path, False)
+        mock_video_capture.return_value = _mock_video_capture(fps, frame_count, width, height)
 
         mock_loader = Mock()
-        mock_mask = TrackingMask(
-            mask=np.ones((480, 640), dtype=np.uint8),
-            confidence=0.95,
-            object_id=1,
-        )
-        mock_frame = TrackingFrame(
-            frame_idx=0,
-            masks=[mock_mask],
-            occlusions={1: False},
-            processing_time=0.1,
-        )
-        mock_result = TrackingResult(
-            frames=[mock_frame],
-            video_width=640,
-            video_height=480,
+        mock_loader.track.return_value = TrackingResult(
+            frames=[
+                TrackingFrame(
+                    frame_idx=0,
+                    masks=[
+                        TrackingMask(mask=_mask(height, width), confidence=0.9, object_id=obj_id)
+                        for obj_id in object_ids
+                    ],
+                    occlusions={obj_id: False for obj_id in object_ids},
+                    processing_time=0.1,
+                )
+            ],
+            video_width=width,
+            video_height=height,
             total_processing_time=0.1,
             fps=10.0,
         )
-        mock_loader.track.return_value = mock_result
         mock_create_loader.return_value = mock_loader
 
-        # Create initial mask
-        initial_mask = np.ones((480, 640), dtype=np.uint8)
-        mask_b64 = base64.b64encode(initial_mask.tobytes()).decode("utf-8")
+        payload = {
+            "video_id": video_id,
+            "initial_masks_rle": [_ones_rle(height, width) for _ in object_ids],
+            "object_ids": object_ids,
+        }
+        if frame_numbers is not None:
+            payload["frame_numbers"] = frame_numbers
 
-        response = test_client_with_mocks.post(
-            "/api/tracking/track",
-            json={
-                "video_id": "test-tracking-123",
-                "initial_masks": [mask_b64],
-                "object_ids": [1],
-                "frame_numbers": [0, 10, 20],
-            },
-        )
+        response = _post_json(test_client_with_mocks, "/api/tracking/track", payload)
 
         assert response.status_code == 200
+        initial_masks = mock_loader.track.call_args.kwargs["initial_masks"]
+        assert len(initial_masks) == len(object_ids)
+        for initial_mask in initial_masks:
+            np.testing.assert_array_equal(initial_mask, _mask(height, width))
         data = response.json()
 
         assert "id" in data
-        assert data["video_id"] == "test-tracking-123"
-        assert "frames" in data
+        assert data["video_id"] == video_id
         assert isinstance(data["frames"], list)
-        assert data["video_width"] == 640
-        assert data["video_height"] == 480
+        assert len(data["frames"]) > 0
+        assert data["video_width"] == width
+        assert data["video_height"] == height
         assert "total_frames" in data
         assert "processing_time" in data
         assert "fps" in data
 
-    @patch("src.video_downloader.download_video_if_needed")
-    @patch("cv2.VideoCapture")
-    @patch("src.tracking_loader.create_tracking_loader")
+        for mask in data["frames"][0]["masks"]:
+            assert "object_id" in mask
+            assert "mask_rle" in mask
+            assert "confidence" in mask
+            assert "is_occluded" in mask
+
     @patch("src.summarization.get_video_path_for_id")
-    def test_track_objects_all_models(
-        self,
-        mock_get_video: Mock,
-        mock_create_loader: Mock,
-        mock_video_capture: Mock,
-        mock_download: AsyncMock,
-        test_client_with_mocks: TestClient,
+    def test_track_objects_missing_masks(
+        self, mock_get_video: Mock, test_client_with_mocks: TestClient
     ) -> None:
-        """Test tracking with all supported models (SAMURAI, SAM2Long, SAM2, YOLO11n-seg)."""
-        import base64
-
-        import numpy as np
-
-        mock_get_video.return_value = Path("/videos/wildlife-video.mp4")
-        mock_download.return_value = ("/videos/wildlife-video.mp4", False)
-
-        mock_cap = Mock()
-        mock_cap.get.side_effect = lambda prop: (
-            30.0
-            if prop == 5
-            else 50
-            if prop == 7
-            else 1920
-            if prop == 3
-            else 1080
-            if prop == 4
-            else 0
-        )
-        mock_cap.read.return_value = (
-            True,
-            np.zeros((1080, 1920, 3), dtype=np.uint8),
-        )
-        mock_cap.set.return_value = True
-        mock_video_capture.return_value = mock_cap
+        """Test tracking with mismatched masks and object_ids."""
+        mock_get_video.return_value = Path("/videos/test-video.mp4")
 
-        from src.tracking_loader import TrackingFrame, TrackingMask, TrackingResult
+        mask_b64 = "AQ=="  # Never decoded: the request fails validation first
 
-        mock_loader = Mock()
-        mock_mask = TrackingMask(
-            mask=np.ones((1080, 1920), dtype=np.uint8),
-            confidence=0.92,
-            object_id=1,
-        )
-        mock_frame = TrackingFrame(
-            frame_idx=0,
-            masks=[mock_mask],
-            occlusions={1: False},
-            processing_time=0.08,
-        )
-        mock_result = TrackingResult(
-            frames=[mock_frame],
-            video_width=1920,
-            video_height=1080,
-            total_processing_time=0.08,
-            fps=12.5,
+        response = _post_json(
+            test_client_with_mocks,
+            "/api/tracking/track",
+            {
+                "video_id": "test-video",
+                "initial_masks": [mask_b64],
+                "object_ids": [1, 2],  # More IDs than masks
+            },
         )
-        mock_loader.track.return_value = mock_result
-        mock_create_loader.return_value = mock_loader
 
-        initial_mask = np.ones((1080, 1920), dtype=np.uint8)
-        mask_b64 = base64.b64encode(initial_mask.tobytes()).decode("utf-8")
+        assert response.status_code == 400
 
-        # Test with each model by verifying the endpoint works
-        response = test_client_with_mocks.post(
+    @patch("src.summarization.get_video_path_for_id")
+    def test_track_objects_both_mask_encodings(
+        self, mock_get_video: Mock, test_client_with_mocks: TestClient
+    ) -> None:
+        """Test tracking rejects requests with both base64 and RLE masks."""
+        mock_get_video.return_value = Path("/videos/test-video.mp4")
+
+        response = _post_json(
+            test_client_with_mocks,
             "/api/tracking/track",
-            json={
-                "video_id": "wildlife-video",
-                "initial_masks": [mask_b64],
+            {
+                "video_id": "test-video",
+                "initial_masks": ["AQ=="],
+                "initial_masks_rle": [_ones_rle(1, 1)],
                 "object_ids": [1],
             },
         )
 
-        assert response.status_code == 200
+        assert response.status_code == 400
 
     @patch("src.video_downloader.download_video_if_needed")
     @patch("cv2.VideoCapture")
     @patch("src.tracking_loader.create_tracking_loader")
     @patch("src.summarization.get_video_path_for_id")
-    def test_track_objects_multiple_objects(
+    def test_track_objects_rle_mask_size_mismatch(
         self,
         mock_get_video: Mock,
         mock_create_loader: Mock,
@@ -974,107 +838,24 @@ class TestTrackingEndpoint:
         mock_download: AsyncMock,
         test_client_with_mocks: TestClient,
     ) -> None:
-        """Test tracking multiple objects simultaneously."""
-        import base64
-
-        import numpy as np
-
-        mock_get_video.return_value = Path("/videos/sports-video.mp4")
-        mock_download.return_value = ("/videos/sports-video.mp4", False)
-
-        mock_cap = Mock()
-        mock_cap.get.side_effect = lambda prop: (
-            60.0
-            if prop == 5
-            else 180
-            if prop == 7
-            else 1280
-            if prop == 3
-            else 720
-            if prop == 4
-            else 0
-        )
-        mock_cap.read.return_value = (True, np.zeros((720, 1280, 3), dtype=np.uint8))
-        mock_cap.set.return_value = True
-        mock_video_capture.return_value = mock_cap
-
-        from src.tracking_loader import TrackingFrame, TrackingMask, TrackingResult
-
-        mock_loader = Mock()
-        mock_mask1 = TrackingMask(
-            mask=np.ones((720, 1280), dtype=np.uint8),
-            confidence=0.88,
-            object_id=1,
-        )
-        mock_mask2 = TrackingMask(
-            mask=np.ones((720, 1280), dtype=np.uint8),
-            confidence=0.91,
-            object_id=2,
-        )
-        mock_frame = TrackingFrame(
-            frame_idx=0,
-            masks=[mock_mask1, mock_mask2],
-            occlusions={1: False, 2: False},
-            processing_time=0.15,
-        )
-        mock_result = TrackingResult(
-            frames=[mock_frame],
-            video_width=1280,
-            video_height=720,
-            total_processing_time=0.15,
-            fps=6.7,
-        )
-        mock_loader.track.return_value = mock_result
-        mock_create_loader.return_value = mock_loader
-
-        initial_mask1 = np.ones((720, 1280), dtype=np.uint8)
-        initial_mask2 = np.ones((720, 1280), dtype=np.uint8) * 2
-        mask1_b64 = base64.b64encode(initial_mask1.tobytes()).decode("utf-8")
-        mask2_b64 = base64.b64encode(initial_mask2.tobytes()).decode("utf-8")
-
-        response = test_client_with_mocks.post(
-            "/api/tracking/track",
-            json={
-                "video_id": "sports-video",
-                "initial_masks": [mask1_b64, mask2_b64],
-                "object_ids": [1, 2],
-            },
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data["frames"]) > 0
-        if len(data["frames"][0]["masks"]) > 0:
-            mask = data["frames"][0]["masks"][0]
-            assert "object_id" in mask
-            assert "mask_rle" in mask
-            assert "confidence" in mask
-            assert "is_occluded" in mask
-
-    @patch("src.summarization.get_video_path_for_id")
-    def test_track_objects_missing_masks(
-        self, mock_get_video: Mock, test_client_with_mocks: TestClient
-    ) -> None:
-        """Test tracking with mismatched masks and object_ids."""
-        import base64
-
-        import numpy as np
-
+        """Test tracking with an RLE mask whose size differs from the video."""
         mock_get_video.return_value = Path("/videos/test-video.mp4")
+        mock_download.return_value = ("/videos/test-video.mp4", False)
 
-        initial_mask = np.ones((480, 640), dtype=np.uint8)
-        mask_b64 = base64.b64encode(initial_mask.tobytes()).decode("utf-8")
+        mock_video_capture.return_value = _mock_video_capture(width=640, height=480)
 
-        response = test_client_with_mocks.post(
+        response = _post_json(
+            test_client_with_mocks,
             "/api/tracking/track",
-            json={
+            {
                 "video_id": "test-video",
-                "initial_masks": [mask_b64],
-                "object_ids": [1, 2],  # More IDs than masks
+                "initial_masks_rle": [_ones_rle(720, 1280)],
+                "object_ids": [1],
             },
         )
 
         assert response.status_code == 400
+        mock_create_loader.return_value.track.assert_not_called()
 
     @patch("src.video_downloader.download_video_if_needed")
     @patch("cv2.VideoCapture")
@@ -1092,26 +873,15 @@ class TestTrackingEndpoint:
         mock_get_video.return_value = Path("/videos/test-video.mp4")
         mock_download.return_value = ("/videos/test-video.mp4", False)
 
-        mock_cap = Mock()
-        mock_cap.get.side_effect = lambda prop: (
-            30.0
-            if prop == 5
-            else 100
-            if prop == 7
-            else 640
-            if prop == 3
-            else 480
-            if prop == 4
-            else 0
-        )
-        mock_video_capture.return_value = mock_cap
+        mock_video_capture.return_value = _mock_video_capture(width=640, height=480)
 
         mock_loader = Mock()
         mock_create_loader.return_value = mock_loader
 
-        response = test_client_with_mocks.post(
+        response = _post_json(
+            test_client_with_mocks,
             "/api/tracking/track",
-            json={
+            {
                 "video_id": "test-video",
                 "initial_masks": ["invalid-base64!!!"],
                 "object_ids": [1],
@@ -1122,16 +892,12 @@ class TestTrackingEndpoint:
 
     def test_track_objects_missing_video_id(self, test_client_with_mocks: TestClient) -> None:
         """Test tracking with missing video_id field."""
-        import base64
-
-        import numpy as np
+        mask_b64 = "AQ=="  # Never decoded: the request fails validation first
 
-        initial_mask = np.ones((480, 640), dtype=np.uint8)
-        mask_b64 = base64.b64encode(initial_mask.tobytes()).decode("utf-8")
-
-        response = test_client_with_mocks.post(
+        response = _post_json(
+            test_client_with_mocks,
             "/api/tracking/track",
-            json={
+            {
                 "initial_masks": [mask_b64],
                 "object_ids": [1],
             },
@@ -1152,38 +918,17 @@ class TestTrackingEndpoint:
         test_client_with_mocks: TestClient,
     ) -> None:
         """Test tracking with object occlusion handling."""
-        import base64
-
-        import numpy as np
-
         mock_get_video.return_value = Path("/videos/vehicle-tracking.mp4")
         mock_download.return_value = ("/videos/vehicle-tracking.mp4", False)
 
-        mock_cap = Mock()
-        mock_cap.get.side_effect = lambda prop: (
-            25.0
-            if prop == 5
-            else 250
-            if prop == 7
-            else 1920
-            if prop == 3
-            else 1080
-            if prop == 4
-            else 0
+        mock_video_capture.return_value = _mock_video_capture(
+            fps=25.0, frame_count=250, width=1920, height=1080
         )
-        mock_cap.read.return_value = (
-            True,
-            np.zeros((1080, 1920, 3), dtype=np.uint8),
-        )
-        mock_cap.set.return_value = True
-        mock_video_capture.return_value = mock_cap
-
-        from src.tracking_loader import TrackingFrame, TrackingMask, TrackingResult
 
         mock_loader = Mock()
         # Object is occluded with low confidence
         mock_mask = TrackingMask(
-            mask=np.ones((1080, 1920), dtype=np.uint8),
+            mask=_mask(1080, 1920),
             confidence=0.35,
             object_id=1,
         )
@@ -1203,12 +948,12 @@ class TestTrackingEndpoint:
         mock_loader.track.return_value = mock_result
         mock_create_loader.return_value = mock_loader
 
-        initial_mask = np.ones((1080, 1920), dtype=np.uint8)
-        mask_b64 = base64.b64encode(initial_mask.tobytes()).decode("utf-8")
+        mask_b64 = _mask_b64(1080, 1920)
 
-        response = test_client_with_mocks.post(
+        response = _post_json(
+            test_client_with_mocks,
             "/api/tracking/track",
-            json={
+            {
                 "video_id": "vehicle-tracking",
                 "initial_masks": [mask_b64],
                 "object_ids": [1],
@@ -1234,34 +979,14 @@ class TestTrackingEndpoint:
         test_client_with_mocks: TestClient,
     ) -> None:
         """Test that tracking response contains all expected fields."""
-        import base64
-
-        import numpy as np
-
         mock_get_video.return_value = Path("/videos/test-structure.mp4")
         mock_download.return_value = ("/videos/test-structure.mp4", False)
 
-        mock_cap = Mock()
-        mock_cap.get.side_effect = lambda prop: (
-            30.0
-            if prop == 5
-            else 100
-            if prop == 7
-            else 640
-            if prop == 3
-            else 480
-            if prop == 4
-            else 0
-        )
-        mock_cap.read.return_value = (True, np.zeros((480, 640, 3), dtype=np.uint8))
-        mock_cap.set.return_value = True
-        mock_video_capture.return_value = mock_cap
-
-        from src.tracking_loader import TrackingFrame, TrackingMask, TrackingResult
+        mock_video_capture.return_value = _mock_video_capture(width=640, height=480)
 
         mock_loader = Mock()
         mock_mask = TrackingMask(
-            mask=np.ones((480, 640), dtype=np.uint8),
+            mask=_mask(480, 640),
             confidence=0.9,
             object_id=1,
         )
@@ -1281,12 +1006,12 @@ class TestTrackingEndpoint:
         mock_loader.track.return_value = mock_result
         mock_create_loader.return_value = mock_loader
 
-        initial_mask = np.ones((480, 640), dtype=np.uint8)
-        mask_b64 = base64.b64encode(initial_mask.tobytes()).decode("utf-8")
+        mask_b64 = _mask_b64(480, 640)
 
-        response = test_client_with_mocks.post(
+        response = _post_json(
+            test_client_with_mocks,
             "/api/tracking/track",
-            json={
+            {
                 "video_id": "test-structure",
                 "initial_masks": [mask_b64],
                 "object_ids": [1],
@@ -1342,12 +1067,6 @@ class TestTrackingEndpoint:
         test_client_with_mocks: TestClient,
     ) -> None:
         """Test tracking when video_id resolves to S3 pre-signed URL."""
-        import base64
-
-        import numpy as np
-
-        from src.tracking_loader import TrackingFrame, TrackingMask, TrackingResult
-
         # Mock get_video_path_for_id to return S3 URL
         mock_get_video.return_value = "https://bucket.s3.amazonaws.com/tracking.mp4?signature=abc"
 
@@ -1355,26 +1074,12 @@ class TestTrackingEndpoint:
         mock_download.return_value = ("/tmp/video_jkl012.mp4", True)
 
         # Mock video capture
-        mock_cap = Mock()
-        mock_cap.get.side_effect = lambda prop: (
-            30.0
-            if prop == 5
-            else 100
-            if prop == 7
-            else 640
-            if prop == 3
-            else 480
-            if prop == 4
-            else 0
-        )
-        mock_cap.read.return_value = (True, np.zeros((480, 640, 3), dtype=np.uint8))
-        mock_cap.set.return_value = True
-        mock_video_capture.return_value = mock_cap
+        mock_video_capture.return_value = _mock_video_capture(width=640, height=480)
 
         # Mock tracking loader
         mock_loader = Mock()
         mock_mask = TrackingMask(
-            mask=np.ones((480, 640), dtype=np.uint8),
+            mask=_mask(480, 640),
             confidence=0.93,
             object_id=1,
         )
@@ -1395,12 +1100,12 @@ class TestTrackingEndpoint:
         mock_create_loader.return_value = mock_loader
 
         # Create initial mask
-        initial_mask = np.ones((480, 640), dtype=np.uint8)
-        mask_b64 = base64.b64encode(initial_mask.tobytes()).decode("utf-8")
+        mask_b64 = _mask_b64(480, 640)
 
-        response = test_client_with_mocks.post(
+        response = _post_json(
+            test_client_with_mocks,
             "/api/tracking/track",
-            json={
+            {
                 "video_id": "test-s3-tracking",
                 "initial_masks": [mask_b64],
                 "object_ids": [1],
@@ -1418,23 +1123,26 @@ class TestTrackingEndpoint:
         mock_cleanup.assert_called_once_with("/tmp/video_jkl012.mp4")
 
 
+@pytest.fixture(scope="module")
+def openapi_response(client: TestClient) -> Response:
+    """Fetch /openapi.json once; the schema does not depend on the mocked manager."""
+    return client.get("/openapi.json")
+
+
 class TestOpenAPIDocumentation:
     """Tests for OpenAPI documentation."""
 
-    def test_openapi_schema_available(self, test_client_with_mocks: TestClient) -> None:
+    def test_openapi_schema_available(self, openapi_response: Response) -> None:
         """Test that OpenAPI schema is available."""
-        response = test_client_with_mocks.get("/openapi.json")
-        assert response.status_code == 200
-        schema = response.json()
+        assert openapi_response.status_code == 200
+        schema = openapi_response.json()
         assert "openapi" in schema
         assert "info" in schema
         assert "paths" in schema
 
-    def test_api_endpoints_documented(self, test_client_with_mocks: TestClient) -> None:
+    def test_api_endpoints_documented(self, openapi_response: Response) -> None:
         """Test that all API endpoints are documented."""
-        response = test_client_with_mocks.get("/openapi.json")
-        schema = response.json()
-        paths = schema["paths"]
+        paths = openapi_response.json()["paths"]
 
         assert "/api/summarize" in paths
         assert "/api/ontology/augment" in paths
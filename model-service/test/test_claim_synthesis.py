@@ -3,7 +3,9 @@ Tests for claim synthesis module.
 Tests the synthesis of narrative summaries from claim hierarchies.
 """
 
-from unittest.mock import AsyncMock, Mock
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
 
 import pytest
 
@@ -14,8 +16,31 @@ from src.claim_synthesis import (
 )
 from src.models import ClaimRelationship, ClaimSource
 
+# Keep the module on one xdist worker so module-scoped fixtures are built once
+pytestmark = pytest.mark.xdist_group("claim_synthesis")
 
-@pytest.fixture
+
+@dataclass
+class FakeLoader:
+    """Async LLM loader stub that records the kwargs of the last generate call."""
+
+    text: str
+    last_kwargs: dict[str, Any] | None = None
+
+    async def generate(self, **kwargs):
+        self.last_kwargs = kwargs
+        return SimpleNamespace(text=self.text)
+
+
+STRATEGY_CASES = [
+    ("hierarchical", ["hierarchical claim structure", "top-level claims"]),
+    ("chronological", ["chronological narrative", "temporal"]),
+    ("narrative", ["engaging narrative", "story-like flow"]),
+    ("analytical", ["analytical summary", "evidence"]),
+]
+
+
+@pytest.fixture(scope="module")
 def sample_claims():
     """Sample claim hierarchy for testing."""
     return [
@@ -47,7 +72,7 @@ def sample_claims():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_claim_source(sample_claims):
     """Sample ClaimSource for testing."""
     return ClaimSource(
@@ -58,7 +83,18 @@ def sample_claim_source(sample_claims):
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def second_claim_source():
+    """Second ClaimSource for multi-source tests."""
+    return ClaimSource(
+        source_id="video-456",
+        source_type="video",
+        claims=[{"id": "claim-10", "text": "Another claim", "confidence": 0.88}],
+        metadata={"title": "Second Video"},
+    )
+
+
+@pytest.fixture(scope="module")
 def sample_claim_relations():
     """Sample claim relations for testing."""
     return [
@@ -72,7 +108,7 @@ def sample_claim_relations():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_ontology_context():
     """Sample ontology context for testing."""
     return {
@@ -87,7 +123,7 @@ def sample_ontology_context():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_persona_context():
     """Sample persona context for testing."""
     return {
@@ -96,6 +132,12 @@ def sample_persona_context():
     }
 
 
+@pytest.fixture(scope="module")
+def formatted_claims(sample_claims):
+    """Top-level formatting of sample_claims, computed once per module."""
+    return _format_claims_hierarchy(sample_claims, indent=0)
+
+
 class TestFormatClaimsHierarchy:
     """Tests for _format_claims_hierarchy function."""
 
@@ -109,9 +151,9 @@ class TestFormatClaimsHierarchy:
         assert "[id: claim-2]" in result[0]
         assert "(confidence: 0.90)" in result[0]
 
-    def test_format_hierarchical_claims(self, sample_claims):
+    def test_format_hierarchical_claims(self, formatted_claims):
         """Test formatting claims with subclaims."""
-        result = _format_claims_hierarchy(sample_claims, indent=0)
+        result = formatted_claims
 
         # Should have parent + 2 children + 1 other
         assert len(result) == 4
@@ -130,6 +172,32 @@ class TestFormatClaimsHierarchy:
         # Subclaims should have 2 indent levels
         assert result[1].startswith("    ")
 
+    def test_format_preserves_depth_first_order(self, formatted_claims):
+        """Test subclaims are emitted directly under their parent."""
+        result = formatted_claims
+
+        assert [line.split(" [id: ")[1].split("]")[0] for line in result] == [
+            "claim-1",
+            "claim-1-1",
+            "claim-1-2",
+            "claim-2",
+        ]
+
+    def test_format_deep_hierarchy(self):
+        """Test hierarchies deeper than the recursion limit are formatted."""
+        depth = 2000
+        root: dict = {"id": "claim-0", "text": "level 0", "subclaims": []}
+        node = root
+        for level in range(1, depth):
+            child = {"id": f"claim-{level}", "text": f"level {level}", "subclaims": []}
+            node["subclaims"] = [child]
+            node = child
+
+        result = _format_claims_hierarchy([root], indent=0)
+
+        assert len(result) == depth
+        assert result[-1] == "  " * (depth - 1) + f"- level {depth - 1} [id: claim-{depth - 1}]"
+
 
 class TestBuildSynthesisPrompt:
     """Tests for build_synthesis_prompt function."""
@@ -147,10 +215,11 @@ class TestBuildSynthesisPrompt:
             include_citations=False,
         )
 
-        assert "synthesizing coherent narratives" in prompt.lower()
+        prompt_lower = prompt.lower()
+        assert "synthesizing coherent narratives" in prompt_lower
         assert "CLAIMS TO SYNTHESIZE" in prompt
         assert "video-123" in prompt or "Rocket Launch Video" in prompt
-        assert "hierarchical claim structure" in prompt.lower()
+        assert "hierarchical claim structure" in prompt_lower
 
     def test_prompt_with_persona_context(self, sample_claim_source, sample_persona_context):
         """Test prompt includes persona context."""
@@ -202,60 +271,17 @@ class TestBuildSynthesisPrompt:
         assert "conflicts_with" in prompt
         assert "Launch time discrepancy" in prompt
 
-    def test_hierarchical_strategy_instructions(self, sample_claim_source):
-        """Test hierarchical strategy includes correct instructions."""
-        prompt = build_synthesis_prompt(
-            claim_sources=[sample_claim_source],
-            claim_relations=None,
-            synthesis_strategy="hierarchical",
-            ontology_context=None,
-            persona_context=None,
-            max_length=500,
-            include_conflicts=False,
-            include_citations=False,
-        )
-
-        assert "hierarchical claim structure" in prompt.lower()
-        assert "top-level claims" in prompt.lower()
-
-    def test_chronological_strategy_instructions(self, sample_claim_source):
-        """Test chronological strategy includes correct instructions."""
-        prompt = build_synthesis_prompt(
-            claim_sources=[sample_claim_source],
-            claim_relations=None,
-            synthesis_strategy="chronological",
-            ontology_context=None,
-            persona_context=None,
-            max_length=500,
-            include_conflicts=False,
-            include_citations=False,
-        )
-
-        assert "chronological narrative" in prompt.lower()
-        assert "temporal" in prompt.lower()
-
-    def test_narrative_strategy_instructions(self, sample_claim_source):
-        """Test narrative strategy includes correct instructions."""
-        prompt = build_synthesis_prompt(
-            claim_sources=[sample_claim_source],
-            claim_relations=None,
-            synthesis_strategy="narrative",
-            ontology_context=None,
-            persona_context=None,
-            max_length=500,
-            include_conflicts=False,
-            include_citations=False,
-        )
-
-        assert "engaging narrative" in prompt.lower()
-        assert "story-like flow" in prompt.lower()
-
-    def test_analytical_strategy_instructions(self, sample_claim_source):
-        """Test analytical strategy includes correct instructions."""
+    @pytest.mark.parametrize(
+        ("strategy", "needles"),
+        STRATEGY_CASES,
+        ids=[strategy for strategy, _ in STRATEGY_CASES],
+    )
+    def test_strategy_instructions(self, sample_claim_source, strategy, needles):
+        """Test each synthesis strategy includes its instructions."""
         prompt = build_synthesis_prompt(
             claim_sources=[sample_claim_source],
             claim_relations=None,
-            synthesis_strategy="analytical",
+            synthesis_strategy=strategy,
             ontology_context=None,
             persona_context=None,
             max_length=500,
@@ -263,8 +289,8 @@ class TestBuildSynthesisPrompt:
             include_citations=False,
         )
 
-        assert "analytical summary" in prompt.lower()
-        assert "evidence" in prompt.lower()
+        prompt_lower = prompt.lower()
+        assert all(needle in prompt_lower for needle in needles)
 
     def test_prompt_with_citations(self, sample_claim_source):
         """Test prompt includes citation instructions."""
@@ -298,31 +324,6 @@ class TestBuildSynthesisPrompt:
 
         assert "750 words" in prompt
 
-    def test_multiple_sources(self, sample_claim_source):
-        """Test prompt with multiple claim sources."""
-        source2 = ClaimSource(
-            source_id="video-456",
-            source_type="video",
-            claims=[{"id": "claim-10", "text": "Another claim", "confidence": 0.88}],
-            metadata={"title": "Second Video"},
-        )
-
-        prompt = build_synthesis_prompt(
-            claim_sources=[sample_claim_source, source2],
-            claim_relations=None,
-            synthesis_strategy="hierarchical",
-            ontology_context=None,
-            persona_context=None,
-            max_length=500,
-            include_conflicts=False,
-            include_citations=False,
-        )
-
-        assert "Source 1:" in prompt
-        assert "Source 2:" in prompt
-        assert "Rocket Launch Video" in prompt
-        assert "Second Video" in prompt
-
 
 class TestSynthesizeSummaryFromClaims:
     """Tests for synthesize_summary_from_claims function."""
@@ -330,11 +331,7 @@ class TestSynthesizeSummaryFromClaims:
     @pytest.mark.asyncio
     async def test_basic_synthesis(self, sample_claim_source):
         """Test basic synthesis without errors."""
-        # Mock LLM loader
-        mock_loader = Mock()
-        mock_result = Mock()
-        mock_result.text = "The rocket was launched successfully and reached orbit."
-        mock_loader.generate = AsyncMock(return_value=mock_result)
+        loader = FakeLoader(text="The rocket was launched successfully and reached orbit.")
 
         result = await synthesize_summary_from_claims(
             claim_sources=[sample_claim_source],
@@ -342,7 +339,7 @@ class TestSynthesizeSummaryFromClaims:
             synthesis_strategy="hierarchical",
             ontology_context=None,
             persona_context=None,
-            llm_loader=mock_loader,
+            llm_loader=loader,
             max_length=500,
             include_conflicts=True,
             include_citations=False,
@@ -363,10 +360,7 @@ class TestSynthesizeSummaryFromClaims:
         sample_persona_context,
     ):
         """Test synthesis with all configuration options."""
-        mock_loader = Mock()
-        mock_result = Mock()
-        mock_result.text = "A comprehensive analysis of the rocket launch."
-        mock_loader.generate = AsyncMock(return_value=mock_result)
+        loader = FakeLoader(text="A comprehensive analysis of the rocket launch.")
 
         result = await synthesize_summary_from_claims(
             claim_sources=[sample_claim_source],
@@ -374,24 +368,23 @@ class TestSynthesizeSummaryFromClaims:
             synthesis_strategy="analytical",
             ontology_context=sample_ontology_context,
             persona_context=sample_persona_context,
-            llm_loader=mock_loader,
+            llm_loader=loader,
             max_length=750,
             include_conflicts=True,
             include_citations=True,
         )
 
         # Verify generate was called
-        assert mock_loader.generate.called
-        call_args = mock_loader.generate.call_args
+        assert loader.last_kwargs is not None
 
         # Check that prompt includes all contexts
-        prompt = call_args[1]["prompt"]
+        prompt = loader.last_kwargs["prompt"]
         assert "Aerospace Analyst" in prompt
         assert "ONTOLOGY TYPES" in prompt
         assert "CONFLICTS DETECTED" in prompt
 
         # Check generation config
-        config = call_args[1]["generation_config"]
+        config = loader.last_kwargs["generation_config"]
         assert config.max_tokens == 8192
         assert config.temperature == 0.8
 
@@ -400,35 +393,27 @@ class TestSynthesizeSummaryFromClaims:
         assert "comprehensive" in result[0]["content"]
 
     @pytest.mark.asyncio
-    async def test_synthesis_multiple_sources(self, sample_claim_source):
+    async def test_synthesis_multiple_sources(self, sample_claim_source, second_claim_source):
         """Test synthesis with multiple claim sources."""
-        source2 = ClaimSource(
-            source_id="video-789",
-            source_type="video",
-            claims=[{"id": "claim-20", "text": "Follow-up observation"}],
-        )
-
-        mock_loader = Mock()
-        mock_result = Mock()
-        mock_result.text = "Multi-source analysis."
-        mock_loader.generate = AsyncMock(return_value=mock_result)
+        loader = FakeLoader(text="Multi-source analysis.")
 
         result = await synthesize_summary_from_claims(
-            claim_sources=[sample_claim_source, source2],
+            claim_sources=[sample_claim_source, second_claim_source],
             claim_relations=None,
             synthesis_strategy="hierarchical",
             ontology_context=None,
             persona_context=None,
-            llm_loader=mock_loader,
+            llm_loader=loader,
             max_length=500,
             include_conflicts=False,
             include_citations=False,
         )
 
-        # Verify multiple sources mentioned in prompt
-        call_args = mock_loader.generate.call_args
-        prompt = call_args[1]["prompt"]
+        # Verify both sources and their titles are in the prompt
+        prompt = loader.last_kwargs["prompt"]
         assert "Source 1:" in prompt
         assert "Source 2:" in prompt
+        assert "Rocket Launch Video" in prompt
+        assert "Second Video" in prompt
 
         assert isinstance(result, list)
@@ -7,22 +7,6 @@ and application lifecycle management.
 
 from datetime import UTC, datetime
 
-import pytest
-from fastapi.testclient import TestClient
-
-from src.main import app
-
-
-@pytest.fixture
-def client():
-    """
-    Create a test client for the FastAPI application.
-
-    Returns:
-        TestClient instance for making test requests
-    """
-    return TestClient(app, base_url="http://testserver")
-
 
 def test_health_check(client):
     """
@@ -5,11 +5,15 @@ This module contains tests for model loading, unloading, memory management,
 and configuration validation.
 """
 
-import tempfile
+import asyncio
+import contextlib
+import json
+import pickle
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
+import torch
 import yaml
 
 from src.model_manager import (
@@ -19,10 +23,58 @@ from src.model_manager import (
     TaskConfig,
 )
 
+# Shared, read-only config dicts; the config classes only read from them
+MODEL_CONFIG_FULL = {
+    "model_id": "test/model",
+    "framework": "pytorch",
+    "vram_gb": 8,
+    "quantization": "4bit",
+    "speed": "fast",
+    "description": "Test model",
+    "fps": 30,
+}
+MODEL_CONFIG_8GB = {"model_id": "test", "framework": "pytorch", "vram_gb": 8}
+MODEL_CONFIG_MIN = {"model_id": "test", "framework": "pytorch"}
+TASK_CONFIG = {
+    "selected": "model-a",
+    "options": {
+        "model-a": {
+            "model_id": "test/model-a",
+            "framework": "pytorch",
+            "vram_gb": 4,
+        },
+        "model-b": {
+            "model_id": "test/model-b",
+            "framework": "sglang",
+            "vram_gb": 8,
+        },
+    },
+}
+INVALID_YAML = "invalid: yaml: content: :"
+CONFIG_TOML = """
+[models.video_summarization]
+selected = "toml-model"
+
+[models.video_summarization.options.toml-model]
+model_id = "test/toml-model"
+framework = "pytorch"
+vram_gb = 4
+
+[inference]
+offload_threshold = 0.9
+"""
+INFERENCE_CONFIG = {
+    "max_memory_per_model": "auto",
+    "offload_threshold": 0.85,
+    "warmup_on_startup": True,
+    "default_batch_size": 2,
+    "max_batch_size": 16,
+}
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def sample_config():
-    """Sample model configuration for testing."""
+    """Sample model configuration for testing (read-only, shared)."""
     return {
         "models": {
             "video_summarization": {
@@ -69,22 +121,70 @@ def sample_config():
     }
 
 
+@pytest.fixture(scope="session")
+def config_file(sample_config, tmp_path_factory):
+    """Write the sample config as YAML once per session and return its path."""
+    config_path = tmp_path_factory.mktemp("model_manager") / "models.yaml"
+    config_path.write_text(yaml.safe_dump(sample_config))
+
+    return str(config_path)
+
+
+@pytest.fixture(scope="session")
+def config_json_file(sample_config, config_file):
+    """Write the sample config as JSON next to config_file, bypassing YAML parsing."""
+    config_path = Path(config_file).with_suffix(".json")
+    config_path.write_text(json.dumps(sample_config))
+
+    return str(config_path)
+
+
+@pytest.fixture(scope="session")
+def config_json(sample_config):
+    """Sample config serialized once per session as JSON, which YAML also accepts."""
+    return json.dumps(sample_config)
+
+
+@pytest.fixture(scope="session")
+def model_manager_snapshot(config_json):
+    """Pickled ModelManager built once per session from the JSON config.
+
+    YAML loading has its own tests, so the shared instance skips the parser.
+    """
+    return pickle.dumps(ModelManager("models.json", config=json.loads(config_json)))
+
+
 @pytest.fixture
-def config_file(sample_config):
-    """Create temporary config file."""
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-        yaml.dump(sample_config, f)
-        config_path = f.name
+def model_manager(model_manager_snapshot):
+    """Create a fresh ModelManager per test so loaded-model state never leaks."""
+    return pickle.loads(model_manager_snapshot)  # noqa: S301
+
+
+# Single stand-in for torch.cuda, reset on each use rather than rebuilt
+_CUDA = MagicMock()
 
-    yield config_path
 
-    Path(config_path).unlink()
+@contextlib.contextmanager
+def mocked_cuda(allocated=0, total=16 * 1024**3):
+    """Swap ``torch.cuda`` for the shared stand-in.
+
+    Describes an available device with ``total`` bytes of memory and
+    ``allocated`` bytes in use, and yields the stand-in.
+    """
+    _CUDA.reset_mock(return_value=True, side_effect=True)
+    _CUDA.is_available.return_value = True
+    _CUDA.current_device.return_value = 0
+    _CUDA.get_device_properties.return_value.total_memory = total
+    _CUDA.memory_allocated.return_value = allocated
+    with patch.object(torch, "cuda", _CUDA):
+        yield _CUDA
 
 
 @pytest.fixture
-def model_manager(config_file):
-    """Create ModelManager instance with test configuration."""
-    return ModelManager(config_file)
+def fake_cuda():
+    """Mocked CUDA for the whole test; adjust e.g. ``fake_cuda.memory_allocated``."""
+    with mocked_cuda() as cuda:
+        yield cuda
 
 
 class TestModelConfig:
@@ -92,16 +192,7 @@ class TestModelConfig:
 
     def test_model_config_initialization(self):
         """Test ModelConfig initialization from dictionary."""
-        config_dict = {
-            "model_id": "test/model",
-            "framework": "pytorch",
-            "vram_gb": 8,
-            "quantization": "4bit",
-            "speed": "fast",
-            "description": "Test model",
-            "fps": 30,
-        }
-        config = ModelConfig(config_dict)
+        config = ModelConfig(MODEL_CONFIG_FULL)
 
         assert config.model_id == "test/model"
         assert config.framework == "pytorch"
@@ -113,13 +204,13 @@ class TestModelConfig:
 
     def test_model_config_vram_bytes(self):
         """Test VRAM conversion from GB to bytes."""
-        config = ModelConfig({"model_id": "test", "framework": "pytorch", "vram_gb": 8})
+        config = ModelConfig(MODEL_CONFIG_8GB)
         expected_bytes = 8 * 1024 * 1024 * 1024
         assert config.vram_bytes == expected_bytes
 
     def test_model_config_optional_fields(self):
         """Test ModelConfig with optional fields."""
-        config = ModelConfig({"model_id": "test", "framework": "pytorch"})
+        config = ModelConfig(MODEL_CONFIG_MIN)
 
         assert config.vram_gb == 0
         assert config.quantization is None
@@ -128,27 +219,29 @@ class TestModelConfig:
         assert config.fps is None
 
 
+@pytest.mark.parametrize(
+    ("config_cls", "args"),
+    [
+        (ModelConfig, (MODEL_CONFIG_FULL,)),
+        (TaskConfig, ("test_task", TASK_CONFIG)),
+        (InferenceConfig, (INFERENCE_CONFIG,)),
+    ],
+)
+def test_config_classes_use_slots(config_cls, args):
+    """Test config objects carry no per-instance __dict__."""
+    config = config_cls(*args)
+
+    assert not hasattr(config, "__dict__")
+    with pytest.raises(AttributeError):
+        config.unknown_field = True
+
+
 class TestTaskConfig:
     """Tests for TaskConfig class."""
 
     def test_task_config_initialization(self):
         """Test TaskConfig initialization from dictionary."""
-        config_dict = {
-            "selected": "model-a",
-            "options": {
-                "model-a": {
-                    "model_id": "test/model-a",
-                    "framework": "pytorch",
-                    "vram_gb": 4,
-                },
-                "model-b": {
-                    "model_id": "test/model-b",
-                    "framework": "sglang",
-                    "vram_gb": 8,
-                },
-            },
-        }
-        task_config = TaskConfig("test_task", config_dict)
+        task_config = TaskConfig("test_task", TASK_CONFIG)
 
         assert task_config.task_name == "test_task"
         assert task_config.selected == "model-a"
@@ -158,17 +251,7 @@ class TestTaskConfig:
 
     def test_get_selected_config(self):
         """Test getting selected model configuration."""
-        config_dict = {
-            "selected": "model-a",
-            "options": {
-                "model-a": {
-                    "model_id": "test/model-a",
-                    "framework": "pytorch",
-                    "vram_gb": 4,
-                },
-            },
-        }
-        task_config = TaskConfig("test_task", config_dict)
+        task_config = TaskConfig("test_task", TASK_CONFIG)
         selected = task_config.get_selected_config()
 
         assert selected.model_id == "test/model-a"
@@ -180,14 +263,7 @@ class TestInferenceConfig:
 
     def test_inference_config_initialization(self):
         """Test InferenceConfig initialization."""
-        config_dict = {
-            "max_memory_per_model": "auto",
-            "offload_threshold": 0.85,
-            "warmup_on_startup": True,
-            "default_batch_size": 2,
-            "max_batch_size": 16,
-        }
-        inference_config = InferenceConfig(config_dict)
+        inference_config = InferenceConfig(INFERENCE_CONFIG)
 
         assert inference_config.max_memory_per_model == "auto"
         assert inference_config.offload_threshold == 0.85
@@ -209,96 +285,102 @@ class TestInferenceConfig:
 class TestModelManager:
     """Tests for ModelManager class."""
 
-    def test_model_manager_initialization(self, model_manager):
+    def test_model_manager_initialization(self, config_file):
         """Test ModelManager initialization."""
+        model_manager = ModelManager(config_file)
+
         assert model_manager is not None
         assert len(model_manager.tasks) == 2
         assert "video_summarization" in model_manager.tasks
         assert "object_detection" in model_manager.tasks
 
-    def test_load_config_file_not_found(self):
+    def test_load_config_json_matches_yaml(self, config_file, config_json_file):
+        """Test a JSON config parses to the same configuration as its YAML source."""
+        assert ModelManager(config_json_file).config == ModelManager(config_file).config
+
+    def test_model_manager_pickle_round_trip(self, config_json):
+        """Test a pickled ModelManager restores its configuration and state."""
+        manager = ModelManager("models.json", config=json.loads(config_json))
+        manager.model_memory_usage["video_summarization"] = 1000
+
+        restored = pickle.loads(pickle.dumps(manager))  # noqa: S301
+
+        assert restored.config == manager.config
+        assert restored.tasks.keys() == manager.tasks.keys()
+        assert restored.tasks["video_summarization"].get_selected_config().vram_gb == 10
+        assert restored.inference_config.offload_threshold == 0.85
+        assert restored.model_memory_usage == {"video_summarization": 1000}
+
+    def test_load_config_toml(self, tmp_path):
+        """Test loading a TOML configuration file."""
+        config_path = tmp_path / "models.toml"
+        config_path.write_text(CONFIG_TOML)
+
+        manager = ModelManager(str(config_path))
+
+        assert manager.tasks["video_summarization"].get_selected_config().vram_gb == 4
+        assert manager.inference_config.offload_threshold == 0.9
+
+    def test_load_config_file_not_found(self, tmp_path):
         """Test loading config from non-existent file."""
         with pytest.raises(FileNotFoundError):
-            ModelManager("/nonexistent/config.yaml")
-
-    def test_load_config_invalid_yaml(self):
-        """Test loading invalid YAML configuration."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write("invalid: yaml: content: :")
-            config_path = f.name
-
-        try:
-            with pytest.raises(yaml.YAMLError):
-                ModelManager(config_path)
-        finally:
-            Path(config_path).unlink()
-
-    @patch("torch.cuda.is_available")
-    @patch("torch.cuda.current_device")
-    @patch("torch.cuda.get_device_properties")
-    @patch("torch.cuda.memory_allocated")
-    def test_get_available_vram(
-        self,
-        mock_mem_allocated,
-        mock_device_props,
-        mock_current_device,
-        mock_cuda_available,
-        model_manager,
-    ):
-        """Test getting available VRAM."""
-        mock_cuda_available.return_value = True
-        mock_current_device.return_value = 0
-        mock_device_props.return_value.total_memory = 16 * 1024**3
-        mock_mem_allocated.return_value = 4 * 1024**3
+            ModelManager(str(tmp_path / "config.yaml"))
 
-        available = model_manager.get_available_vram()
+    def test_load_config_invalid_yaml(self, tmp_path):
+        """Test loading invalid YAML configuration from a file."""
+        config_path = tmp_path / "bad.yaml"
+        config_path.write_text(INVALID_YAML)
+
+        with pytest.raises(yaml.YAMLError):
+            ModelManager(str(config_path))
+
+    def test_from_yaml_string_invalid_yaml(self):
+        """Test loading invalid YAML configuration from a string."""
+        with pytest.raises(yaml.YAMLError):
+            ModelManager.from_yaml_string(INVALID_YAML)
+
+    def test_pyyaml_fallback_without_ryaml(self, monkeypatch, config_json):
+        """Test configs parse identically when the optional ryaml backend is absent."""
+        with_default_backend = ModelManager.from_yaml_string(config_json).config
+        monkeypatch.setattr("src.model_manager._ryaml", None)
+
+        assert ModelManager.from_yaml_string(config_json).config == with_default_backend
+        with pytest.raises(yaml.YAMLError):
+            ModelManager.from_yaml_string(INVALID_YAML)
+
+    def test_from_yaml_string_matches_file(self, config_file, config_json):
+        """Test YAML text and the equivalent file give the same configuration."""
+        from_text = ModelManager.from_yaml_string(config_json)
+
+        assert from_text.config == ModelManager(config_file).config
+        assert from_text.tasks.keys() == {"video_summarization", "object_detection"}
+
+    def test_get_available_vram(self, model_manager):
+        """Test getting available VRAM."""
+        with mocked_cuda(allocated=4 * 1024**3):
+            available = model_manager.get_available_vram()
         expected = 12 * 1024**3
 
         assert available == expected
 
-    @patch("torch.cuda.is_available")
-    def test_get_available_vram_no_cuda(self, mock_cuda_available, model_manager):
+    def test_get_available_vram_no_cuda(self, fake_cuda, model_manager):
         """Test getting available VRAM when CUDA is not available."""
-        mock_cuda_available.return_value = False
+        fake_cuda.is_available.return_value = False
 
         available = model_manager.get_available_vram()
 
         assert available == 0
 
-    @patch("torch.cuda.is_available")
-    @patch("torch.cuda.current_device")
-    @patch("torch.cuda.get_device_properties")
-    def test_get_total_vram(
-        self, mock_device_props, mock_current_device, mock_cuda_available, model_manager
-    ):
+    def test_get_total_vram(self, fake_cuda, model_manager):
         """Test getting total VRAM."""
-        mock_cuda_available.return_value = True
-        mock_current_device.return_value = 0
-        mock_device_props.return_value.total_memory = 16 * 1024**3
-
         total = model_manager.get_total_vram()
 
         assert total == 16 * 1024**3
 
-    @patch("torch.cuda.is_available")
-    @patch("torch.cuda.current_device")
-    @patch("torch.cuda.memory_allocated")
-    @patch("torch.cuda.get_device_properties")
-    def test_get_memory_usage_percentage(
-        self,
-        mock_device_props,
-        mock_mem_allocated,
-        mock_current_device,
-        mock_cuda_available,
-        model_manager,
-    ):
+    def test_get_memory_usage_percentage(self, model_manager):
         """Test getting memory usage percentage."""
-        mock_cuda_available.return_value = True
-        mock_current_device.return_value = 0
-        mock_device_props.return_value.total_memory = 16 * 1024**3
-        mock_mem_allocated.return_value = 4 * 1024**3
-
-        usage = model_manager.get_memory_usage_percentage()
+        with mocked_cuda(allocated=4 * 1024**3):
+            usage = model_manager.get_memory_usage_percentage()
 
         assert usage == 0.25
 
@@ -314,26 +396,24 @@ class TestModelManager:
         assert lru is None
 
     @pytest.mark.asyncio
-    async def test_unload_model(self, model_manager):
+    async def test_unload_model(self, fake_cuda, model_manager):
         """Test unloading a model."""
         model_manager.loaded_models["test_task"] = {"model": "data"}
         model_manager.model_load_times["test_task"] = 123456
         model_manager.model_memory_usage["test_task"] = 1000
 
-        with patch("torch.cuda.is_available", return_value=True), patch("torch.cuda.empty_cache"):
-            await model_manager.unload_model("test_task")
+        await model_manager.unload_model("test_task")
 
         assert "test_task" not in model_manager.loaded_models
         assert "test_task" not in model_manager.model_load_times
         assert "test_task" not in model_manager.model_memory_usage
 
-    @pytest.mark.asyncio
-    async def test_unload_model_not_loaded(self, model_manager):
+    def test_unload_model_not_loaded(self, model_manager):
         """Test unloading a model that is not loaded."""
-        await model_manager.unload_model("nonexistent_task")
+        asyncio.run(model_manager.unload_model("nonexistent_task"))
 
     @pytest.mark.asyncio
-    async def test_evict_lru_model(self, model_manager):
+    async def test_evict_lru_model(self, fake_cuda, model_manager):
         """Test evicting LRU model."""
         model_manager.loaded_models["task1"] = {"model": "data1"}
         model_manager.loaded_models["task2"] = {"model": "data2"}
@@ -342,48 +422,42 @@ class TestModelManager:
         model_manager.model_memory_usage["task1"] = 1000
         model_manager.model_memory_usage["task2"] = 2000
 
-        with patch("torch.cuda.is_available", return_value=True), patch("torch.cuda.empty_cache"):
-            evicted = await model_manager.evict_lru_model()
+        evicted = await model_manager.evict_lru_model()
 
         assert evicted == "task1"
         assert "task1" not in model_manager.loaded_models
         assert "task2" in model_manager.loaded_models
 
-    @pytest.mark.asyncio
-    async def test_evict_lru_model_empty(self, model_manager):
+    def test_evict_lru_model_empty(self, model_manager):
         """Test evicting LRU model when no models loaded."""
-        evicted = await model_manager.evict_lru_model()
+        evicted = asyncio.run(model_manager.evict_lru_model())
         assert evicted is None
 
     @pytest.mark.asyncio
-    async def test_load_model(self, model_manager):
+    async def test_load_model(self, fake_cuda, model_manager):
         """Test loading a model."""
-        with (
-            patch.object(model_manager, "check_memory_available", return_value=True),
-            patch("torch.cuda.is_available", return_value=True),
-            patch("torch.cuda.memory_allocated", side_effect=[0, 5 * 1024**3]),
-        ):
+        fake_cuda.memory_allocated.side_effect = [0, 5 * 1024**3]
+
+        with patch.object(model_manager, "check_memory_available", return_value=True):
             model = await model_manager.load_model("video_summarization")
 
         assert model is not None
         assert "video_summarization" in model_manager.loaded_models
         assert model_manager.loaded_models["video_summarization"] == model
 
-    @pytest.mark.asyncio
-    async def test_load_model_already_loaded(self, model_manager):
+    def test_load_model_already_loaded(self, model_manager):
         """Test loading a model that is already loaded."""
         existing_model = {"model": "existing"}
         model_manager.loaded_models["video_summarization"] = existing_model
 
-        model = await model_manager.load_model("video_summarization")
+        model = asyncio.run(model_manager.load_model("video_summarization"))
 
         assert model == existing_model
 
-    @pytest.mark.asyncio
-    async def test_load_model_invalid_task(self, model_manager):
+    def test_load_model_invalid_task(self, model_manager):
         """Test loading model with invalid task type."""
         with pytest.raises(ValueError, match="Invalid task type"):
-            await model_manager.load_model("invalid_task")
+            asyncio.run(model_manager.load_model("invalid_task"))
 
     @pytest.mark.asyncio
     async def test_load_model_with_eviction(self, model_manager):
@@ -393,13 +467,12 @@ class TestModelManager:
         model_manager.model_memory_usage["other_task"] = 1000
 
         with (
+            mocked_cuda() as cuda,
             patch.object(model_manager, "check_memory_available", side_effect=[False, True]),
             patch.object(model_manager, "get_memory_usage_percentage", return_value=0.9),
             patch.object(model_manager, "get_total_vram", return_value=32 * 1024**3),
-            patch("torch.cuda.is_available", return_value=True),
-            patch("torch.cuda.memory_allocated", side_effect=[0, 5 * 1024**3]),
-            patch("torch.cuda.empty_cache"),
         ):
+            cuda.memory_allocated.side_effect = [0, 5 * 1024**3]
             await model_manager.load_model("video_summarization")
 
         assert "video_summarization" in model_manager.loaded_models
@@ -416,13 +489,11 @@ class TestModelManager:
             await model_manager.load_model("video_summarization")
 
     @pytest.mark.asyncio
-    async def test_get_model(self, model_manager):
+    async def test_get_model(self, fake_cuda, model_manager):
         """Test getting model (loads if needed)."""
-        with (
-            patch.object(model_manager, "check_memory_available", return_value=True),
-            patch("torch.cuda.is_available", return_value=True),
-            patch("torch.cuda.memory_allocated", side_effect=[0, 5 * 1024**3]),
-        ):
+        fake_cuda.memory_allocated.side_effect = [0, 5 * 1024**3]
+
+        with patch.object(model_manager, "check_memory_available", return_value=True):
             model = await model_manager.get_model("video_summarization")
 
         assert model is not None
@@ -454,88 +525,86 @@ class TestModelManager:
 
         assert config is None
 
-    @pytest.mark.asyncio
-    async def test_set_selected_model(self, model_manager):
+    def test_set_selected_model(self, model_manager):
         """Test changing selected model."""
-        await model_manager.set_selected_model("video_summarization", "test-model-2")
+        asyncio.run(model_manager.set_selected_model("video_summarization", "test-model-2"))
 
         assert model_manager.tasks["video_summarization"].selected == "test-model-2"
         assert model_manager.config["models"]["video_summarization"]["selected"] == "test-model-2"
 
-    @pytest.mark.asyncio
-    async def test_set_selected_model_invalid_task(self, model_manager):
+    def test_set_selected_model_invalid_task(self, model_manager):
         """Test changing selected model with invalid task."""
         with pytest.raises(ValueError, match="Invalid task type"):
-            await model_manager.set_selected_model("invalid_task", "some-model")
+            asyncio.run(model_manager.set_selected_model("invalid_task", "some-model"))
 
-    @pytest.mark.asyncio
-    async def test_set_selected_model_invalid_model(self, model_manager):
+    def test_set_selected_model_invalid_model(self, model_manager):
         """Test changing selected model with invalid model name."""
         with pytest.raises(ValueError, match="Invalid model name"):
-            await model_manager.set_selected_model("video_summarization", "nonexistent-model")
+            asyncio.run(
+                model_manager.set_selected_model("video_summarization", "nonexistent-model")
+            )
 
     @pytest.mark.asyncio
-    async def test_set_selected_model_with_reload(self, model_manager):
+    async def test_set_selected_model_with_reload(self, fake_cuda, model_manager):
         """Test changing selected model when model is loaded."""
         model_manager.loaded_models["video_summarization"] = {"model": "old"}
         model_manager.model_load_times["video_summarization"] = 100
         model_manager.model_memory_usage["video_summarization"] = 1000
 
-        with (
-            patch.object(model_manager, "check_memory_available", return_value=True),
-            patch("torch.cuda.is_available", return_value=True),
-            patch("torch.cuda.memory_allocated", side_effect=[0, 3 * 1024**3]),
-            patch("torch.cuda.empty_cache"),
-        ):
+        fake_cuda.memory_allocated.side_effect = [0, 3 * 1024**3]
+
+        with patch.object(model_manager, "check_memory_available", return_value=True):
             await model_manager.set_selected_model("video_summarization", "test-model-2")
 
         assert model_manager.tasks["video_summarization"].selected == "test-model-2"
         assert "video_summarization" in model_manager.loaded_models
 
-    def test_validate_memory_budget(self, model_manager):
-        """Test validating memory budget."""
-        with patch.object(model_manager, "get_total_vram", return_value=32 * 1024**3):
+    @pytest.mark.parametrize(
+        ("total_vram_gb", "valid", "max_allowed_gb"),
+        [(32, True, 27.2), (8, False, 6.8)],
+        ids=["sufficient", "insufficient"],
+    )
+    def test_validate_memory_budget(self, model_manager, total_vram_gb, valid, max_allowed_gb):
+        """Test validating memory budget against the selected models (10 GB + 2 GB)."""
+        with patch.object(model_manager, "get_total_vram", return_value=total_vram_gb * 1024**3):
             validation = model_manager.validate_memory_budget()
 
-        assert validation["valid"] is True
-        assert validation["total_vram_gb"] == 32
+        assert validation["valid"] is valid
+        assert validation["total_vram_gb"] == total_vram_gb
         assert validation["total_required_gb"] == 12
         assert validation["threshold"] == 0.85
-        assert abs(validation["max_allowed_gb"] - 27.2) < 0.01
+        assert validation["max_allowed_gb"] == pytest.approx(max_allowed_gb, abs=0.01)
         assert len(validation["model_requirements"]) == 2
 
-    def test_validate_memory_budget_insufficient(self, model_manager):
-        """Test validating memory budget with insufficient memory."""
-        with patch.object(model_manager, "get_total_vram", return_value=8 * 1024**3):
+    def test_validate_memory_budget_counts_selected_models_only(self, model_manager):
+        """Test unselected model options do not add to the required memory."""
+        model_manager.tasks["video_summarization"].selected = "test-model-2"
+
+        with patch.object(model_manager, "get_total_vram", return_value=32 * 1024**3):
             validation = model_manager.validate_memory_budget()
 
-        assert validation["valid"] is False
-        assert validation["total_required_gb"] == 12
-        assert abs(validation["max_allowed_gb"] - 6.8) < 0.01
+        assert validation["total_required_gb"] == 7
 
-    @pytest.mark.asyncio
-    async def test_warmup_models_disabled(self, model_manager):
+    def test_warmup_models_disabled(self, model_manager):
         """Test warmup when disabled in config."""
-        await model_manager.warmup_models()
+        asyncio.run(model_manager.warmup_models())
 
         assert len(model_manager.loaded_models) == 0
 
     @pytest.mark.asyncio
-    async def test_warmup_models_enabled(self, model_manager):
+    async def test_warmup_models_enabled(self, fake_cuda, model_manager):
         """Test warmup when enabled in config."""
         model_manager.inference_config.warmup_on_startup = True
 
-        with (
-            patch.object(model_manager, "check_memory_available", return_value=True),
-            patch("torch.cuda.is_available", return_value=True),
-            patch("torch.cuda.memory_allocated", side_effect=[0, 5 * 1024**3, 0, 2 * 1024**3]),
-        ):
+        fake_cuda.memory_allocated.side_effect = [0, 5 * 1024**3, 0, 2 * 1024**3]
+
+        with patch.object(model_manager, "check_memory_available", return_value=True):
             await model_manager.warmup_models()
 
         assert len(model_manager.loaded_models) == 2
 
     @pytest.mark.asyncio
-    async def test_shutdown(self, model_manager):
+    async def test_shutdown(self, fake_cuda, model_manager):
         """Test shutdown unloads all models."""
         model_manager.loaded_models["task1"] = {"model": "data1"}
         model_manager.loaded_models["task2"] = {"model": "data2"}
@@ -544,8 +613,7 @@ class TestModelManager:
         model_manager.model_memory_usage["task1"] = 1000
         model_manager.model_memory_usage["task2"] = 2000
 
-        with patch("torch.cuda.is_available", return_value=True), patch("torch.cuda.empty_cache"):
-            await model_manager.shutdown()
+        await model_manager.shutdown()
 
         assert len(model_manager.loaded_models) == 0
 
@@ -604,20 +672,9 @@ class TestExternalAPISupport:
         }
 
     @pytest.fixture
-    def external_api_config_file(self, external_api_config):
-        """Create temporary config file with external API models."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            yaml.dump(external_api_config, f)
-            config_path = f.name
-
-        yield config_path
-
-        Path(config_path).unlink()
-
-    @pytest.fixture
-    def external_api_manager(self, external_api_config_file):
+    def external_api_manager(self, external_api_config):
         """Create ModelManager instance with external API configuration."""
-        return ModelManager(external_api_config_file)
+        return ModelManager.from_yaml_string(json.dumps(external_api_config))
 
     def test_is_external_api_true(self, external_api_manager):
         """Test is_external_api returns True for external API models."""
@@ -4,26 +4,37 @@ This module tests prompt generation, LLM response parsing, confidence scoring,
 and end-to-end ontology augmentation across diverse domains.
 """
 
+import asyncio
+import dataclasses
 import json
 from unittest.mock import AsyncMock, patch
 
+import numpy as np
 import pytest
 
 from src.llm_loader import GenerationResult, LLMConfig, LLMFramework
 from src.models import OntologyType
 from src.ontology_augmentation import (
     AugmentationContext,
+    _fused_score_kernel,
+    _numpy_score_kernel,
+    _ObjectScanner,
+    _response_cache,
+    _top_k_indices,
+    augment_many,
     augment_ontology_with_llm,
     calculate_confidence,
     create_augmentation_prompt,
     generate_augmentation_reasoning,
     parse_llm_response,
+    release_cached_loaders,
+    score_suggestions,
 )
 
 # Note: parse_llm_response signature changed - removed unused target_category parameter
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def wildlife_research_context() -> AugmentationContext:
     """Wildlife research context for marine mammal tracking."""
     return AugmentationContext(
@@ -35,7 +46,7 @@ def wildlife_research_context() -> AugmentationContext:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sports_analytics_context() -> AugmentationContext:
     """Sports analytics context for baseball game analysis."""
     return AugmentationContext(
@@ -47,7 +58,7 @@ def sports_analytics_context() -> AugmentationContext:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def retail_analysis_context() -> AugmentationContext:
     """Retail analysis context for customer behavior tracking."""
     return AugmentationContext(
@@ -59,7 +70,7 @@ def retail_analysis_context() -> AugmentationContext:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def medical_training_context() -> AugmentationContext:
     """Medical training context for surgical procedure annotation."""
     return AugmentationContext(
@@ -71,7 +82,7 @@ def medical_training_context() -> AugmentationContext:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def film_production_context() -> AugmentationContext:
     """Film production context for continuity tracking."""
     return AugmentationContext(
@@ -83,7 +94,7 @@ def film_production_context() -> AugmentationContext:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_llm_config() -> LLMConfig:
     """Mock LLM configuration for testing."""
     return LLMConfig(
@@ -175,6 +186,27 @@ class TestPromptGeneration:
         assert "Information Need" not in prompt
         assert context.domain in prompt
 
+    def test_create_prompt_reuses_cached_prompt(
+        self, wildlife_research_context: AugmentationContext
+    ) -> None:
+        """Test equal contexts share a cached prompt and changed types rebuild it."""
+        prompt = create_augmentation_prompt(wildlife_research_context, max_suggestions=5)
+        same_context = AugmentationContext(
+            domain=wildlife_research_context.domain,
+            existing_types=list(wildlife_research_context.existing_types),
+            target_category=wildlife_research_context.target_category,
+            persona_role=wildlife_research_context.persona_role,
+            information_need=wildlife_research_context.information_need,
+        )
+        extended_context = AugmentationContext(
+            domain=wildlife_research_context.domain,
+            existing_types=[*wildlife_research_context.existing_types, "Dolphin"],
+            target_category=wildlife_research_context.target_category,
+        )
+
+        assert create_augmentation_prompt(same_context, max_suggestions=5) is prompt
+        assert "Dolphin" in create_augmentation_prompt(extended_context, max_suggestions=5)
+
 
 class TestResponseParsing:
     """Test suite for LLM response parsing."""
@@ -231,6 +263,42 @@ class TestResponseParsing:
         assert len(parsed) == 1
         assert parsed[0]["name"] == "Changeup"
 
+    def test_parse_response_with_leading_bracketed_text(self) -> None:
+        """Test text starting with a non-JSON bracket falls back to locating the array."""
+        response_text = '[Note] Suggestions below.\n[{"name": "Bunt", "description": "Soft hit."}]'
+
+        parsed = parse_llm_response(response_text)
+
+        assert [item["name"] for item in parsed] == ["Bunt"]
+
+    def test_parse_response_with_non_standard_literals(self) -> None:
+        """Test NaN literals parse the same whether or not orjson is installed."""
+        response_text = '[{"name": "Drift", "description": "Slow roll.", "score": NaN}]'
+
+        parsed = parse_llm_response(response_text)
+
+        assert [item["name"] for item in parsed] == ["Drift"]
+
+    def test_parse_response_with_brackets_in_strings(self) -> None:
+        """Test brackets and escaped quotes inside strings do not end the array."""
+        response_text = r"""
+        Note [1]: suggestions follow.
+        [
+          {
+            "name": "Batter's Box",
+            "description": "Area marked \"[box]\" where the batter stands ]",
+            "examples": ["Left [L]", "Right \\"]
+          }
+        ]
+        Trailing prose with a stray ] bracket.
+        """
+
+        parsed = parse_llm_response(response_text)
+
+        assert len(parsed) == 1
+        assert parsed[0]["description"] == 'Area marked "[box]" where the batter stands ]'
+        assert parsed[0]["examples"] == ["Left [L]", "Right \\"]
+
     def test_parse_response_missing_optional_fields(self) -> None:
         """Test parsing response with missing optional fields."""
         response_text = """
@@ -249,6 +317,29 @@ class TestResponseParsing:
         assert parsed[0]["parent"] is None
         assert parsed[0]["examples"] == []
 
+    def test_object_scanner_handles_split_chunks(self) -> None:
+        """Test streamed objects are completed across chunks, ignoring braces in strings."""
+        scanner = _ObjectScanner()
+        text = 'Here: [{"name": "A}", "examples": ["{x"]}, {"name": "B\\"}"}]'
+
+        completed = [item for i in range(0, len(text), 5) for item in scanner.feed(text[i : i + 5])]
+
+        assert [json.loads(item)["name"] for item in completed] == ["A}", 'B"}']
+
+    def test_object_scanner_starts_at_array(self) -> None:
+        """Test the scanner matches _find_json_array, skipping objects outside the array."""
+        scanner = _ObjectScanner()
+        text = (
+            'Format each as {"name": "Prose"} [see below]:\n'
+            '[ {"name": "A", "description": "a"}, {"name": "B", "description": "b"}]\n'
+            'Also {"name": "After"}'
+        )
+
+        completed = [item for i in range(0, len(text), 4) for item in scanner.feed(text[i : i + 4])]
+
+        assert [json.loads(item)["name"] for item in completed] == ["A", "B"]
+        assert [item["name"] for item in parse_llm_response(text)] == ["A", "B"]
+
     def test_parse_invalid_json_raises_error(self) -> None:
         """Test that invalid JSON raises ValueError."""
         response_text = "This is not valid JSON at all"
@@ -391,6 +482,74 @@ class TestConfidenceScoring:
 
         assert confidence <= 1.0
 
+    def test_domain_tokens_computed_once(
+        self, wildlife_research_context: AugmentationContext
+    ) -> None:
+        """Test domain tokens and existing type names are precomputed on the context."""
+        tokens = wildlife_research_context.domain_tokens
+
+        assert {"whale", "pod", "migration"} <= tokens
+        assert wildlife_research_context.domain_tokens is tokens
+        assert wildlife_research_context.existing_set == {"Whale", "Pod", "Vessel"}
+
+    def test_context_is_frozen_with_interned_category(self) -> None:
+        """Test contexts are immutable, slotted, and share category strings."""
+        category = "".join(["ev", "ent"])
+        context = AugmentationContext(domain="Sports", existing_types=[], target_category=category)
+
+        assert context.target_category is AugmentationContext("x", [], "event").target_category
+        assert not hasattr(context, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            context.domain = "Retail"  # type: ignore[misc]
+
+    def test_score_suggestions_matches_scalar_scoring(
+        self, wildlife_research_context: AugmentationContext
+    ) -> None:
+        """Test batch scores equal calculate_confidence for each suggestion."""
+        suggestions = [
+            {
+                "name": "WhaleBreaching",
+                "description": "Whale jumps completely or partially out of water.",
+                "parent": "Whale",
+                "examples": ["Full Breach", "Partial Breach"],
+            },
+            {"name": "Ripple", "description": "Short", "parent": None, "examples": []},
+            {
+                "name": "PodFormation",
+                "description": "Arrangement of whales travelling together.",
+                "parent": "UnknownType",
+                "examples": ["Echelon"],
+            },
+        ]
+
+        scores = score_suggestions(suggestions, wildlife_research_context)
+
+        assert scores.tolist() == [
+            calculate_confidence(s, wildlife_research_context) for s in suggestions
+        ]
+
+    def test_score_kernels_agree(self) -> None:
+        """Test the fused-loop kernel matches the NumPy kernel exactly."""
+        rng = np.random.default_rng(0)
+        features = (
+            rng.random(64) < 0.8,
+            rng.integers(0, 40, 64),
+            rng.integers(0, 4, 64),
+            rng.random(64) < 0.5,
+            rng.random(64) < 0.5,
+        )
+
+        assert _fused_score_kernel(*features).tolist() == _numpy_score_kernel(*features).tolist()
+
+    @pytest.mark.parametrize("k", [0, 1, 5, 19, 20, 25])
+    def test_top_k_indices_matches_stable_sort(self, k: int) -> None:
+        """Test top-k selection keeps the stable full-sort order, including ties."""
+        scores = np.random.default_rng(k).choice([0.4, 0.6, 0.75, 0.85, 1.0], size=20)
+
+        expected = np.argsort(-scores, kind="stable")[:k]
+
+        assert _top_k_indices(scores, k).tolist() == expected.tolist()
+
 
 class TestReasoningGeneration:
     """Test suite for reasoning generation."""
@@ -527,6 +686,7 @@ class TestEndToEndAugmentation:
 
             assert suggestions[1].name == "ResearchVessel"
             assert suggestions[1].parent == "Vessel"
+            assert suggestions == [OntologyType(**s.model_dump()) for s in suggestions]
 
             mock_loader.load.assert_called_once()
             mock_loader.generate.assert_called_once()
@@ -622,6 +782,288 @@ class TestEndToEndAugmentation:
 
             mock_loader.unload.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_augment_ontology_reuses_cached_response(
+        self,
+        film_production_context: AugmentationContext,
+        mock_llm_config: LLMConfig,
+    ) -> None:
+        """Test reuse_cached_response skips loading the model for a repeated prompt."""
+        _response_cache.clear()
+        mock_response = GenerationResult(
+            text=json.dumps([{"name": "Swapped", "description": "Prop replaced between takes."}]),
+            tokens_used=50,
+            finish_reason="eos",
+        )
+
+        with patch("src.ontology_augmentation.LLMLoader") as mock_loader_class:
+            mock_loader = AsyncMock()
+            mock_loader.generate = AsyncMock(return_value=mock_response)
+            mock_loader_class.return_value = mock_loader
+
+            uncached = await augment_ontology_with_llm(film_production_context, mock_llm_config)
+            assert not _response_cache
+
+            first = await augment_ontology_with_llm(
+                film_production_context, mock_llm_config, reuse_cached_response=True
+            )
+            cached = await augment_ontology_with_llm(
+                film_production_context, mock_llm_config, reuse_cached_response=True
+            )
+            fresh = await augment_ontology_with_llm(film_production_context, mock_llm_config)
+
+        assert cached == first == uncached
+        assert fresh == first
+        assert mock_loader_class.call_count == 3
+        assert mock_loader.unload.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_augment_ontology_reuses_loader(
+        self,
+        film_production_context: AugmentationContext,
+        mock_llm_config: LLMConfig,
+    ) -> None:
+        """Test reuse_loader loads the model once and keeps it until released."""
+        mock_response = GenerationResult(
+            text=json.dumps([{"name": "Swapped", "description": "Prop replaced between takes."}]),
+            tokens_used=50,
+            finish_reason="eos",
+        )
+
+        with patch("src.ontology_augmentation.LLMLoader") as mock_loader_class:
+            mock_loader = AsyncMock()
+            mock_loader.generate = AsyncMock(return_value=mock_response)
+            mock_loader_class.return_value = mock_loader
+
+            for _ in range(3):
+                await augment_ontology_with_llm(
+                    film_production_context, mock_llm_config, reuse_loader=True
+                )
+
+            assert mock_loader_class.call_count == 1
+            mock_loader.load.assert_awaited_once()
+            assert mock_loader.generate.await_count == 3
+            mock_loader.unload.assert_not_awaited()
+
+            await release_cached_loaders()
+
+        mock_loader.unload.assert_awaited_once()
+
+    def test_augment_ontology_reuse_loader_across_event_loops(
+        self,
+        film_production_context: AugmentationContext,
+        mock_llm_config: LLMConfig,
+    ) -> None:
+        """Test the loader cache can be contended from separate event loops."""
+        mock_response = GenerationResult(
+            text=json.dumps([{"name": "Swapped", "description": "Prop replaced between takes."}]),
+            tokens_used=50,
+            finish_reason="eos",
+        )
+
+        async def slow_load() -> None:
+            await asyncio.sleep(0)
+
+        async def contend() -> None:
+            await asyncio.gather(
+                *(
+                    augment_ontology_with_llm(
+                        film_production_context, mock_llm_config, reuse_loader=True
+                    )
+                    for _ in range(2)
+                )
+            )
+            await release_cached_loaders()
+
+        with patch("src.ontology_augmentation.LLMLoader") as mock_loader_class:
+            mock_loader = AsyncMock()
+            mock_loader.load = AsyncMock(side_effect=slow_load)
+            mock_loader.generate = AsyncMock(return_value=mock_response)
+            mock_loader_class.return_value = mock_loader
+
+            asyncio.run(contend())
+            asyncio.run(contend())
+
+        assert mock_loader.load.await_count == 2
+        assert mock_loader.generate.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_augment_ontology_with_caller_loader(
+        self,
+        film_production_context: AugmentationContext,
+        mock_llm_config: LLMConfig,
+    ) -> None:
+        """Test a caller-provided loader is used without loading or unloading it."""
+        loader = AsyncMock()
+        loader.generate = AsyncMock(
+            return_value=GenerationResult(
+                text=json.dumps([{"name": "Reshoot", "description": "Scene filmed again."}]),
+                tokens_used=50,
+                finish_reason="eos",
+            )
+        )
+
+        with patch("src.ontology_augmentation.LLMLoader") as mock_loader_class:
+            suggestions = await augment_ontology_with_llm(
+                film_production_context, mock_llm_config, loader=loader
+            )
+
+        assert [s.name for s in suggestions] == ["Reshoot"]
+        mock_loader_class.assert_not_called()
+        loader.load.assert_not_awaited()
+        loader.unload.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_augment_many_shares_one_loader(
+        self,
+        wildlife_research_context: AugmentationContext,
+        sports_analytics_context: AugmentationContext,
+        mock_llm_config: LLMConfig,
+    ) -> None:
+        """Test augment_many loads the model once and keeps results in context order."""
+
+        async def generate(prompt: str, _config: object) -> GenerationResult:
+            name = "Calf" if "Whale" in prompt else "Bunt"
+            return GenerationResult(
+                text=json.dumps([{"name": name, "description": "Suggested type."}]),
+                tokens_used=50,
+                finish_reason="eos",
+            )
+
+        with patch("src.ontology_augmentation.LLMLoader") as mock_loader_class:
+            mock_loader = AsyncMock()
+            mock_loader.generate = AsyncMock(side_effect=generate)
+            mock_loader_class.return_value = mock_loader
+
+            results = await augment_many(
+                [wildlife_research_context, sports_analytics_context],
+                mock_llm_config,
+            )
+
+        assert [[s.name for s in r] for r in results] == [["Calf"], ["Bunt"]]
+        assert mock_loader_class.call_count == 1
+        mock_loader.load.assert_awaited_once()
+        mock_loader.unload.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_augment_many_unloads_after_failure(
+        self,
+        film_production_context: AugmentationContext,
+        wildlife_research_context: AugmentationContext,
+        sports_analytics_context: AugmentationContext,
+        mock_llm_config: LLMConfig,
+    ) -> None:
+        """Test a failing context stops the batch before the model is unloaded."""
+        events: list[str] = []
+
+        async def generate(prompt: str, _config: object) -> GenerationResult:
+            events.append("generate-started")
+            await asyncio.sleep(0)
+            if "Film" in prompt:
+                raise RuntimeError("Generation failed")
+            events.append("generate-finished")
+            return GenerationResult(
+                text=json.dumps([{"name": "Take", "description": "Suggested type."}]),
+                tokens_used=50,
+                finish_reason="eos",
+            )
+
+        async def unload() -> None:
+            events.append("unload")
+
+        with patch("src.ontology_augmentation.LLMLoader") as mock_loader_class:
+            mock_loader = AsyncMock()
+            mock_loader.generate = AsyncMock(side_effect=generate)
+            mock_loader.unload = AsyncMock(side_effect=unload)
+            mock_loader_class.return_value = mock_loader
+
+            with pytest.raises(RuntimeError, match="Generation failed"):
+                await augment_many(
+                    [
+                        film_production_context,
+                        wildlife_research_context,
+                        sports_analytics_context,
+                    ],
+                    mock_llm_config,
+                )
+            await asyncio.sleep(0.01)
+
+        assert events == ["generate-started", "unload"]
+
+    @pytest.mark.asyncio
+    async def test_augment_ontology_stream_stops_early(
+        self,
+        film_production_context: AugmentationContext,
+        mock_llm_config: LLMConfig,
+    ) -> None:
+        """Test streaming stops consuming output once enough suggestions are complete."""
+        _response_cache.clear()
+        objects = [
+            json.dumps({"name": f"Take{i}", "description": "Recorded attempt."}) for i in range(5)
+        ]
+        consumed: list[str] = []
+
+        async def generate_stream(_prompt: str, _config: object):
+            for chunk in ["[", ", ".join(objects), "]"]:
+                for i in range(0, len(chunk), 7):
+                    consumed.append(chunk[i : i + 7])
+                    yield chunk[i : i + 7]
+
+        loader = AsyncMock()
+        loader.generate_stream = generate_stream
+
+        suggestions = await augment_ontology_with_llm(
+            film_production_context, mock_llm_config, max_suggestions=2, loader=loader, stream=True
+        )
+
+        assert sorted(s.name for s in suggestions) == ["Take0", "Take1"]
+        assert "".join(consumed) in "[" + ", ".join(objects[:3])
+        loader.generate.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_augment_ontology_stream_not_cached(
+        self,
+        film_production_context: AugmentationContext,
+        mock_llm_config: LLMConfig,
+    ) -> None:
+        """Test a truncated streamed response is not reused by a later full request."""
+        _response_cache.clear()
+        objects = [{"name": f"Take{i}", "description": "Recorded attempt."} for i in range(5)]
+
+        async def generate_stream(_prompt: str, _config: object):
+            yield json.dumps(objects)
+
+        loader = AsyncMock()
+        loader.generate_stream = generate_stream
+        loader.generate = AsyncMock(
+            return_value=GenerationResult(
+                text=json.dumps(objects), tokens_used=50, finish_reason="eos"
+            )
+        )
+
+        streamed = await augment_ontology_with_llm(
+            film_production_context,
+            mock_llm_config,
+            max_suggestions=2,
+            reuse_cached_response=True,
+            loader=loader,
+            stream=True,
+        )
+        assert len(streamed) == 2
+        assert not _response_cache
+
+        full = await augment_ontology_with_llm(
+            film_production_context,
+            mock_llm_config,
+            max_suggestions=2,
+            reuse_cached_response=True,
+            loader=loader,
+        )
+
+        loader.generate.assert_awaited_once()
+        assert len(full) == 2
+        assert len(_response_cache) == 1
+
 
 class TestDiverseDomainCoverage:
     """Test suite ensuring diverse domain examples."""